@@ -1,4 +1,5 @@
 from __future__ import annotations
+import functools
 
 """
 Implementation of the nodes use to represent a program just above assembly level.
@@ -7,26 +8,47 @@ Implementation of the nodes use to represent a program just above assembly level
 REGISTERS = "ABCDEGMLXYSPUVFZ"
 FLAGS = "NCOI-TSZ"
 
+# Each register's 32-bit partner is the one whose index differs in the lowest bit.
+_REG_HI = {c: REGISTERS[i ^ 1] for i, c in enumerate(REGISTERS)}
+
+@functools.lru_cache(maxsize=4096)
+def _fmt_imm(num: int, is32bit: bool) -> str:
+    return f"{num & (0xFFFFFFFF if is32bit else 0xFFFF):X}h"
+
+def _join_operands(ops: list['Operand']) -> str:
+    # Most statements have at most two operands; avoid list+join for those.
+    n = len(ops)
+    if n == 0: return ""
+    if n == 1: return str(ops[0])
+    if n == 2: return str(ops[0]) + ", " + str(ops[1])
+    return ", ".join(map(str, ops))
+
 ###################
 
 class Statement:
+    __slots__ = ("comment",)
+
     def __init__(self):
         self.comment = ""
         
     def add_comment(self, text: str):
-        if len(self.comment.strip()) == 0:
+        comment = self.comment
+        if not comment or not comment.strip():
             return text
         
-        if len(text.strip()) == 0:
-            return "\t\t; " + self.comment
+        if not text or not text.strip():
+            return "\t\t; " + comment
         
-        return text + " ; " + self.comment
+        return text + " ; " + comment
         
-class Operand: pass
+class Operand:
+    __slots__ = ()
 
 ###################
 
 class LabelStatement(Statement):
+    __slots__ = ("label",)
+
     def __init__(self, label: str):
         super().__init__()
         self.label = label
@@ -39,15 +61,19 @@ class LabelStatement(Statement):
         return self.add_comment(self.label + ":") + same_line
 
 class OpStatement(Statement):
-    def __init__(self, opcode: str):
+    __slots__ = ("opcode", "operands")
+
+    def __init__(self, opcode: str, operands: list['Operand'] | None = None):
         super().__init__()
         self.opcode = opcode
-        self.operands: list['Operand'] = []
+        self.operands: list['Operand'] = operands if operands is not None else []
         
     def __str__(self):
-        return self.add_comment("\t" + self.opcode + " " + ", ".join([str(x) for x in self.operands])) + "\n"
+        return self.add_comment(f"\t{self.opcode} {_join_operands(self.operands)}") + "\n"
 
 class PreprocDirective(Statement):
+    __slots__ = ("directive",)
+
     def __init__(self, directive: str):
         super().__init__()
         self.directive = directive
@@ -56,15 +82,19 @@ class PreprocDirective(Statement):
         return self.directive + "\n"
 
 class Directive(Statement):
-    def __init__(self, directive: str):
+    __slots__ = ("directive", "operands")
+
+    def __init__(self, directive: str, operands: list['Operand'] | None = None):
         super().__init__()
         self.directive = directive
-        self.operands: list['Operand'] = []
+        self.operands: list['Operand'] = operands if operands is not None else []
         
     def __str__(self):
-        return self.add_comment("\t" + self.directive + " " + ", ".join([str(x) for x in self.operands])) + "\n"
+        return self.add_comment(f"\t{self.directive} {_join_operands(self.operands)}") + "\n"
 
 class LabelOperand(Operand):
+    __slots__ = ("label",)
+
     def __init__(self, label: str):
         self.label = label
     
@@ -72,43 +102,79 @@ class LabelOperand(Operand):
         return self.label
 
 class ImmOperand(Operand):
+    __slots__ = ("num", "is32bit")
+
     def __init__(self, num: int, is32bit: bool = False):
         self.num = num
         self.is32bit = is32bit
         
     def __str__(self):
-        num = self.num & (0xFFFFFFFF if self.is32bit else 0xFFFF)
-        return f"{num:X}h"
+        return _fmt_imm(self.num, self.is32bit)
 
 class StrOperand(Operand):
-    def __init__(self, bytes: list[int] = []):
-        self.bytes = list(bytes)
-    
+    __slots__ = ("bytes",)
+
+    def __init__(self, data: list[int] = ()):
+        self.bytes = bytes(data)
+
     def __str__(self):
-        return '"' + "".join([chr(x) for x in self.bytes]) + '"'
+        return '"' + self.bytes.decode("latin-1") + '"'
 
 class RegisterOperand(Operand):
+    __slots__ = ("register", "is32bit", "_rendered")
+
     def __init__(self, register: str = "Z", is32bit: bool = False):
         self.register = register
         self.is32bit = is32bit
+        self._rendered = None
     
     def __str__(self):
-        REG_LO = self.register
-        REG_HI = REGISTERS[REGISTERS.find(self.register) ^ 1]
-        reg = REG_HI + REG_LO if self.is32bit else REG_LO
-        return "%" + reg
+        rendered = self._rendered
+        if rendered is None:
+            reg = _REG_HI[self.register] + self.register if self.is32bit else self.register
+            rendered = self._rendered = "%" + reg
+        return rendered
 
 class MemoryOperand(Operand):
+    __slots__ = ("reg", "imm", "_rendered")
+
     def __init__(self, reg: 'RegisterOperand', imm: 'ImmOperand | LabelOperand | None'):
         self.reg = reg
         self.imm = imm
+        self._rendered = None
         
     def __str__(self):
-        if self.imm:
-            return f"$({self.reg}+{self.imm})"
-        else:
-            return f"$({self.reg})"
+        rendered = self._rendered
+        if rendered is None:
+            if self.imm:
+                rendered = self._rendered = f"$({self.reg}+{self.imm})"
+            else:
+                rendered = self._rendered = f"$({self.reg})"
+        return rendered
 
 class Space(Statement):
+    __slots__ = ()
+
     def __str__(self):
-        return self.add_comment("\t") + "\n"
\ No newline at end of file
+        return self.add_comment("\t") + "\n"
+###################
+
+def emit_all(stmts, file=None) -> str | None:
+    """
+    Renders every statement in `stmts` in one pass.
+    
+    Returns the joined string, or writes directly to `file` (and returns None) if one is given.
+    """
+    if file is None:
+        return "".join(str(stmt) for stmt in stmts)
+    file.writelines(str(stmt) for stmt in stmts)
+
+@functools.lru_cache(maxsize=None)
+def register(name: str = "Z", is32bit: bool = False) -> 'RegisterOperand':
+    "Returns a shared RegisterOperand for this register/width combo."
+    return RegisterOperand(name, is32bit)
+
+@functools.lru_cache(maxsize=4096)
+def label(name: str) -> 'LabelOperand':
+    "Returns a shared LabelOperand for this label string."
+    return LabelOperand(name)
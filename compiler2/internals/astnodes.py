@@ -1,19 +1,27 @@
 from __future__ import annotations
-from dataclasses import dataclass
 
 """
 https://docs.python.org/3/library/ast.html
 """
 
-@dataclass  
 class AST:
+    """
+    Base node class. A plain slotted class on purpose: no dataclass machinery,
+    and `_fields`/`_attribs`/`_child_fields` live on the class, not the instance.
+    Subclasses must chain `super().__init__()` so the location slots get set.
+    """
+    __slots__ = ("symref", "lineno", "col_offset", "end_lineno", "end_col_offset")
+
     _fields: tuple[str, ...] = ()
     _attribs: tuple[str, ...] = ()
-    symref: any = None # A reference to a symbol in a symbol table
-    lineno: int | None = None
-    col_offset: int | None = None
-    end_lineno: int | None = None
-    end_col_offset: int | None = None
+    _child_fields: tuple[str, ...] = () # Subset of _attribs+_fields that can ever hold AST nodes
+
+    def __init__(self):
+        self.symref: any = None # A reference to a symbol in a symbol table
+        self.lineno: int | None = None
+        self.col_offset: int | None = None
+        self.end_lineno: int | None = None
+        self.end_col_offset: int | None = None
 
 def get_source_segment(source: str, node: 'AST', padded: bool = False) -> str | None:
     """
@@ -29,20 +37,10 @@ def get_source_segment(source: str, node: 'AST', padded: bool = False) -> str |
     if padded:
         col_offset = 0
     
-    lines = []
-    cur_line = ""
-    for c in source:
-        if len(lines) == end_lineno: break
-        if c == "\n":
-            lines.append(cur_line)
-            cur_line = ""
-            continue
-        cur_line += c
-    if cur_line != "": lines.append(cur_line)
-    del c, cur_line
-    
-    for _ in range(lineno-1): lines.pop(0)
-    lines[end_lineno-lineno] = lines[end_lineno-lineno][:end_col_offset+1]
+    lines = source.splitlines()[lineno-1:end_lineno]
+    if not lines: return None
+
+    lines[-1] = lines[-1][:end_col_offset+1]
     lines[0] = lines[0][col_offset:]
     return "\n".join(lines)
 
@@ -60,22 +58,24 @@ def fix_missing_locations(node: 'AST') -> 'AST':
     """
     https://docs.python.org/3/library/ast.html#ast.fix_missing_locations
     """
-    def _fix(node: 'AST', lineno, col_offset, end_lineno, end_col_offset):
-        if node.lineno == None: node.lineno = lineno
-        else: lineno = node.lineno
-        
-        if node.col_offset == None: node.col_offset = col_offset
-        else: col_offset = node.col_offset
-        
-        if node.end_lineno == None: node.end_lineno = end_lineno
-        else: end_lineno = node.end_lineno
-        
-        if node.end_col_offset == None: node.end_col_offset = end_col_offset
-        else: end_col_offset = node.end_col_offset
-        
-        for child in iter_child_nodes(node):
-            _fix(child, lineno, col_offset, end_lineno, end_col_offset)
-    _fix(node, 1, 0, 1, 0)
+    stack = [(node, 1, 0, 1, 0)]
+    while stack:
+        cur, lineno, col_offset, end_lineno, end_col_offset = stack.pop()
+
+        if cur.lineno is None: cur.lineno = lineno
+        else: lineno = cur.lineno
+
+        if cur.col_offset is None: cur.col_offset = col_offset
+        else: col_offset = cur.col_offset
+
+        if cur.end_lineno is None: cur.end_lineno = end_lineno
+        else: end_lineno = cur.end_lineno
+
+        if cur.end_col_offset is None: cur.end_col_offset = end_col_offset
+        else: end_col_offset = cur.end_col_offset
+
+        for child in iter_child_nodes(cur):
+            stack.append((child, lineno, col_offset, end_lineno, end_col_offset))
     return node
 
 def increment_lineno(node: 'AST', n=1) -> 'AST':
@@ -85,8 +85,10 @@ def increment_lineno(node: 'AST', n=1) -> 'AST':
     https://docs.python.org/3/library/ast.html#ast.increment_lineno
     """
     for child in walk(node):
-        if child.lineno != None: child.lineno += n
-        if child.end_lineno != None: child.end_lineno += n
+        lineno = child.lineno
+        if lineno is not None: child.lineno = lineno + n
+        end_lineno = child.end_lineno
+        if end_lineno is not None: child.end_lineno = end_lineno + n
     return node
 
 def iter_fields(node: 'AST') -> tuple[str, any]:
@@ -117,34 +119,29 @@ def iter_child_nodes(node: 'AST') -> 'AST':
     
     https://docs.python.org/3/library/ast.html#ast.iter_child_nodes
     """
-    for _, attrib in iter_attribs(node):
-        if isinstance(attrib, AST):
-            yield attrib
-        elif isinstance(attrib, list):
-            for item in attrib:
-                if isinstance(item, AST):
-                    yield item
-    for _, field in iter_fields(node):
-        if isinstance(field, AST):
-            yield field
-        elif isinstance(field, list):
-            for item in field:
+    for name in node._child_fields:
+        value = getattr(node, name, None)
+        if isinstance(value, AST):
+            yield value
+        elif type(value) is list:
+            for item in value:
                 if isinstance(item, AST):
                     yield item
 
 def walk(node) -> 'AST':
     """
-    Recursively yield all descendants in BFS. The order of child nodes is unspecified.
-    
+    Recursively yield all descendants in DFS. The order of child nodes is unspecified.
+
     https://docs.python.org/3/library/ast.html#ast.walk
     """
-    from collections import deque
-    todo = deque([node])
+    todo = [node]
     while todo:
-        node = todo.popleft()
+        node = todo.pop()
         todo.extend(iter_child_nodes(node))
         yield node
 
+_MISSING = object() # Sentinel for absent node attributes
+
 class NodeVisitor:
     """
     Basically the same as the ast package's NodeVisitor, just worse.
@@ -153,8 +150,16 @@ class NodeVisitor:
     """
     def visit(self, node) -> 'AST':
         """Visit a node"""
-        method = "visit_" + node.__class__.__name__
-        visitor = getattr(self, method, self.generic_visit)
+        # Bound visit_* methods are cached per node class so repeat visits
+        # skip the string concat and attribute walk.
+        try:
+            dispatch = self._dispatch
+        except AttributeError:
+            dispatch = self._dispatch = {}
+        visitor = dispatch.get(node.__class__)
+        if visitor is None:
+            method = "visit_" + node.__class__.__name__
+            visitor = dispatch[node.__class__] = getattr(self, method, self.generic_visit)
         return visitor(node)
         
     def generic_visit(self, node) -> 'AST':
@@ -173,34 +178,16 @@ class NodeTransformer(NodeVisitor):
     https://docs.python.org/3/library/ast.html#ast.NodeTransformer
     """
     def generic_visit(self, node) -> 'AST':
-        for attrib, old in iter_attribs(node):
-            if isinstance(old, list):
-                new = []
-                for value in old:
-                    if isinstance(value, AST):
-                        value = self.visit(old)
-                        if value is None:
-                            continue
-                        elif isinstance(value, list):
-                            new.extend(value)
-                            continue
-                        else:
-                            new.append(value)
-                            continue
-                    new.append(value)
-                old[:] = new
-            elif isinstance(old, AST):
-                new = self.visit(old)
-                if new is None:
-                    delattr(node, attrib)
-                else:
-                    setattr(node, attrib, new)
-        for field, old in iter_fields(node):
+        visit = self.visit
+        for name in (*node._attribs, *node._fields):
+            old = getattr(node, name, _MISSING)
+            if old is _MISSING:
+                continue
             if isinstance(old, list):
                 new = []
                 for value in old:
                     if isinstance(value, AST):
-                        value = self.visit(old)
+                        value = visit(value)
                         if value is None:
                             continue
                         elif isinstance(value, list):
@@ -212,156 +199,217 @@ class NodeTransformer(NodeVisitor):
                     new.append(value)
                 old[:] = new
             elif isinstance(old, AST):
-                new = self.visit(old)
+                new = visit(old)
                 if new is None:
-                    delattr(node, field)
+                    delattr(node, name)
                 else:
-                    setattr(node, field, new)
+                    setattr(node, name, new)
         return node
 
 ### GENERATED CLASSES FOR IDK ###
 
 ## TYPE 'Module'
 class Module(AST):
+	__slots__ = ("decls",)
+	_fields = ("decls",)
+	_child_fields = ("decls",)
 	def __init__(self, decls: list['Decl']):
-		self._fields = ("decls",)
+		super().__init__()
 		self.decls: list['Decl'] = decls
 
 ## TYPE 'Type'
 class Type(AST):
+	__slots__ = ("is_volatile",)
+	_attribs = ("is_volatile",)
+	_child_fields = ()
 	def __init__(self, is_volatile: bool):
-		self._attribs = ("is_volatile",)
+		super().__init__()
 		self.is_volatile: bool = is_volatile
 
-class VoidType(Type): pass
+class VoidType(Type):
+	__slots__ = ()
 
 class RefType(Type):
+	__slots__ = ("ref_type_name",)
+	_fields = ("ref_type_name",)
+	_child_fields = ()
 	def __init__(self, is_volatile: bool, ref_type_name: str):
 		super().__init__(is_volatile)
-		self._fields = ("ref_type_name",)
 		self.ref_type_name: str = ref_type_name
 
 class IntType(Type):
+	__slots__ = ("type",)
+	_fields = ("type",)
+	_child_fields = ()
 	def __init__(self, is_volatile: bool, type: str):
 		super().__init__(is_volatile)
-		self._fields = ("type",)
 		self.type: str = type
 
 class ArrayType(Type):
+	__slots__ = ("inner_type", "size")
+	_fields = ("inner_type", "size",)
+	_child_fields = ("inner_type", "size")
 	def __init__(self, is_volatile: bool, inner_type: 'Type', size: 'Expr' | None):
 		super().__init__(is_volatile)
-		self._fields = ("inner_type", "size",)
 		self.inner_type: 'Type' = inner_type
 		self.size: 'Expr' | None = size
 
 class FuncType(Type):
+	__slots__ = ("return_type", "param_types", "is_variadic", "_nparams")
+	_fields = ("return_type", "param_types", "is_variadic",)
+	_child_fields = ("return_type", "param_types")
 	def __init__(self, is_volatile: bool, return_type: 'Type', param_types: list['Type'], is_variadic: bool):
 		super().__init__(is_volatile)
-		self._fields = ("return_type", "param_types", "is_variadic",)
 		self.return_type: 'Type' = return_type
 		self.param_types: list['Type'] = param_types
 		self.is_variadic: bool = is_variadic
+		self._nparams: int = len(param_types) # signatures never change after construction
 
 class StructType(Type):
+	__slots__ = ("members", "_member_index")
+	_fields = ("members",)
+	_child_fields = ("members",)
 	def __init__(self, is_volatile: bool, members: list['MemberData']):
 		super().__init__(is_volatile)
-		self._fields = ("members",)
 		self.members: list['MemberData'] = members
+		self._member_index: dict[str, 'MemberData'] | None = None # name lookup, built on first access
 
 class UnionType(Type):
+	__slots__ = ("members", "_member_index")
+	_fields = ("members",)
+	_child_fields = ("members",)
 	def __init__(self, is_volatile: bool, members: list['MemberData']):
 		super().__init__(is_volatile)
-		self._fields = ("members",)
 		self.members: list['MemberData'] = members
+		self._member_index: dict[str, 'MemberData'] | None = None # name lookup, built on first access
 
 ## TYPE 'MemberData'
 class MemberData(AST):
+	__slots__ = ("name", "type", "bits")
+	_fields = ("name", "type", "bits",)
+	_child_fields = ("type",)
 	def __init__(self, name: str, type: 'Type', bits: int | None):
-		self._fields = ("name", "type", "bits",)
+		super().__init__()
 		self.name: str = name
 		self.type: 'Type' = type
 		self.bits: int | None = bits
 
 ## TYPE 'Decl'
 class Decl(AST):
+	__slots__ = ("name", "type", "description")
+	_attribs = ("name", "type", "description",)
+	_child_fields = ("type",)
 	def __init__(self, name: str, type: 'Type', description: str | None):
-		self._attribs = ("name", "type", "description",)
+		super().__init__()
 		self.name: str = name
 		self.type: 'Type' = type
 		self.description: str | None = description
 
 class VarDecl(Decl):
+	__slots__ = ("value", "is_static")
+	_fields = ("value", "is_static",)
+	_child_fields = ("type", "value")
 	def __init__(self, name: str, type: 'Type', description: str | None, value: 'Expr' | None, is_static: bool):
 		super().__init__(name, type, description)
-		self._fields = ("value", "is_static",)
 		self.value: 'Expr' | None = value
 		self.is_static: bool = is_static
 
 class ConstDecl(Decl):
+	__slots__ = ("value", "is_static")
+	_fields = ("value", "is_static",)
+	_child_fields = ("type", "value")
 	def __init__(self, name: str, type: 'Type', description: str | None, value: 'Expr', is_static: bool):
 		super().__init__(name, type, description)
-		self._fields = ("value", "is_static",)
 		self.value: 'Expr' = value
 		self.is_static: bool = is_static
 
 class FuncDecl(Decl):
+	__slots__ = ("param_names", "body", "is_static", "is_inline")
+	_fields = ("param_names", "body", "is_static", "is_inline",)
+	_child_fields = ("type", "body")
 	def __init__(self, name: str, type: 'Type', description: str | None, param_names: list[str], body: 'Stmt' | None, is_static: bool, is_inline: bool):
 		super().__init__(name, type, description)
-		self._fields = ("param_names", "body", "is_static", "is_inline",)
 		self.param_names: list[str] = param_names
 		self.body: 'Stmt' | None = body
 		self.is_static: bool = is_static
 		self.is_inline: bool = is_inline
 
-class TypeDecl(Decl): pass
+class TypeDecl(Decl):
+	__slots__ = ()
 
 ## TYPE 'Stmt'
-class Stmt(AST): pass
+class Stmt(AST):
+	__slots__ = ()
 
-class EmptyStmt(Stmt): pass
+class EmptyStmt(Stmt):
+	__slots__ = ()
 
 class DefStmt(Stmt):
+	__slots__ = ("decl",)
+	_fields = ("decl",)
+	_child_fields = ("decl",)
 	def __init__(self, decl: 'Decl'):
-		self._fields = ("decl",)
+		super().__init__()
 		self.decl: 'Decl' = decl
 
 class CompoundStmt(Stmt):
+	__slots__ = ("stmts",)
+	_fields = ("stmts",)
+	_child_fields = ("stmts",)
 	def __init__(self, stmts: list['Stmt']):
-		self._fields = ("stmts",)
+		super().__init__()
 		self.stmts: list['Stmt'] = stmts
 
 class ExprStmt(Stmt):
+	__slots__ = ("expr",)
+	_fields = ("expr",)
+	_child_fields = ("expr",)
 	def __init__(self, expr: 'Expr'):
-		self._fields = ("expr",)
+		super().__init__()
 		self.expr: 'Expr' = expr
 
 class ContinueStmt(Stmt):
+	__slots__ = ("label",)
+	_fields = ("label",)
+	_child_fields = ()
 	def __init__(self, label: str | None):
-		self._fields = ("label",)
+		super().__init__()
 		self.label: str | None = label
 
 class BreakStmt(Stmt):
+	__slots__ = ("breakif", "label")
+	_fields = ("breakif", "label",)
+	_child_fields = ()
 	def __init__(self, breakif: bool, label: str | None):
-		self._fields = ("breakif", "label",)
+		super().__init__()
 		self.breakif: bool = breakif
 		self.label: str | None = label
 
 class ReturnStmt(Stmt):
+	__slots__ = ("ret_expr",)
+	_fields = ("ret_expr",)
+	_child_fields = ("ret_expr",)
 	def __init__(self, ret_expr: 'Expr' | None):
-		self._fields = ("ret_expr",)
+		super().__init__()
 		self.ret_expr: 'Expr' | None = ret_expr
 
 class IfStmt(Stmt):
+	__slots__ = ("cond_expr", "body", "else_body", "label")
+	_fields = ("cond_expr", "body", "else_body", "label",)
+	_child_fields = ("cond_expr", "body", "else_body")
 	def __init__(self, cond_expr: 'Expr', body: 'Stmt', else_body: 'Stmt' | None, label: str | None):
-		self._fields = ("cond_expr", "body", "else_body", "label",)
+		super().__init__()
 		self.cond_expr: 'Expr' = cond_expr
 		self.body: 'Stmt' = body
 		self.else_body: 'Stmt' | None = else_body
 		self.label: str | None = label
 
 class IterStmt(Stmt):
+	__slots__ = ("init_expr", "cond_expr", "inc_expr", "body", "else_body", "label")
+	_fields = ("init_expr", "cond_expr", "inc_expr", "body", "else_body", "label",)
+	_child_fields = ("init_expr", "cond_expr", "inc_expr", "body", "else_body")
 	def __init__(self, init_expr: 'Expr' | None, cond_expr: 'Expr' | None, inc_expr: 'Expr' | None, body: 'Stmt', else_body: 'Stmt' | None, label: str | None):
-		self._fields = ("init_expr", "cond_expr", "inc_expr", "body", "else_body", "label",)
+		super().__init__()
 		self.init_expr: 'Expr' | None = init_expr
 		self.cond_expr: 'Expr' | None = cond_expr
 		self.inc_expr: 'Expr' | None = inc_expr
@@ -370,186 +418,277 @@ class IterStmt(Stmt):
 		self.label: str | None = label
 
 ## TYPE 'Expr'
-class Expr(AST): pass
+class Expr(AST):
+	__slots__ = ()
 
 class NameExpr(Expr):
+	__slots__ = ("name",)
+	_fields = ("name",)
+	_child_fields = ()
 	def __init__(self, name: str):
-		self._fields = ("name",)
+		super().__init__()
 		self.name: str = name
 
 class IntExpr(Expr):
+	__slots__ = ("type", "value")
+	_fields = ("type", "value",)
+	_child_fields = ("type",)
 	def __init__(self, type: 'IntType', value: int):
-		self._fields = ("type", "value",)
+		super().__init__()
 		self.type: 'IntType' = type
 		self.value: int = value
 
 class StrExpr(Expr):
+	__slots__ = ("utf8",)
+	_fields = ("utf8",)
+	_child_fields = ()
 	def __init__(self, utf8: list[int]):
-		self._fields = ("utf8",)
+		super().__init__()
 		self.utf8: list[int] = utf8
 
 class SzexprExpr(Expr):
+	__slots__ = ("expr",)
+	_fields = ("expr",)
+	_child_fields = ("expr",)
 	def __init__(self, expr: 'Expr'):
-		self._fields = ("expr",)
+		super().__init__()
 		self.expr: 'Expr' = expr
 
 class SztypeExpr(Expr):
+	__slots__ = ("type",)
+	_fields = ("type",)
+	_child_fields = ("type",)
 	def __init__(self, type: 'Type'):
-		self._fields = ("type",)
+		super().__init__()
 		self.type: 'Type' = type
 
 class CallExpr(Expr):
+	__slots__ = ("func_expr", "args")
+	_fields = ("func_expr", "args",)
+	_child_fields = ("func_expr", "args")
 	def __init__(self, func_expr: 'Expr', args: list['Expr']):
-		self._fields = ("func_expr", "args",)
+		super().__init__()
 		self.func_expr: 'Expr' = func_expr
 		self.args: list['Expr'] = args
 
 class IndexExpr(Expr):
+	__slots__ = ("array_expr", "index_expr")
+	_fields = ("array_expr", "index_expr",)
+	_child_fields = ("array_expr", "index_expr")
 	def __init__(self, array_expr: 'Expr', index_expr: 'Expr'):
-		self._fields = ("array_expr", "index_expr",)
+		super().__init__()
 		self.array_expr: 'Expr' = array_expr
 		self.index_expr: 'Expr' = index_expr
 
 class AccessExpr(Expr):
+	__slots__ = ("record_expr", "member_name")
+	_fields = ("record_expr", "member_name",)
+	_child_fields = ("record_expr",)
 	def __init__(self, record_expr: 'Expr', member_name: str):
-		self._fields = ("record_expr", "member_name",)
+		super().__init__()
 		self.record_expr: 'Expr' = record_expr
 		self.member_name: str = member_name
 
 class CastExpr(Expr):
+	__slots__ = ("expr", "cast_type", "signed")
+	_fields = ("expr", "cast_type", "signed",)
+	_child_fields = ("expr", "cast_type")
 	def __init__(self, expr: 'Expr', cast_type: 'Type', signed: bool):
-		self._fields = ("expr", "cast_type", "signed",)
+		super().__init__()
 		self.expr: 'Expr' = expr
 		self.cast_type: 'Type' = cast_type
 		self.signed: bool = signed
 
 class DerefExpr(Expr):
+	__slots__ = ("pointer_expr",)
+	_fields = ("pointer_expr",)
+	_child_fields = ("pointer_expr",)
 	def __init__(self, pointer_expr: 'Expr'):
-		self._fields = ("pointer_expr",)
+		super().__init__()
 		self.pointer_expr: 'Expr' = pointer_expr
 
 class AddrOfExpr(Expr):
+	__slots__ = ("expr",)
+	_fields = ("expr",)
+	_child_fields = ("expr",)
 	def __init__(self, expr: 'Expr'):
-		self._fields = ("expr",)
+		super().__init__()
 		self.expr: 'Expr' = expr
 
 class UnaryExpr(Expr):
+	__slots__ = ("op", "expr")
+	_fields = ("op", "expr",)
+	_child_fields = ("op", "expr")
 	def __init__(self, op: 'UnaryOp', expr: 'Expr'):
-		self._fields = ("op", "expr",)
+		super().__init__()
 		self.op: 'UnaryOp' = op
 		self.expr: 'Expr' = expr
 
 class UnaryCondExpr(Expr):
+	__slots__ = ("op", "expr")
+	_fields = ("op", "expr",)
+	_child_fields = ("op", "expr")
 	def __init__(self, op: 'UnaryCOp', expr: 'Expr'):
-		self._fields = ("op", "expr",)
+		super().__init__()
 		self.op: 'UnaryCOp' = op
 		self.expr: 'Expr' = expr
 
 class BinaryExpr(Expr):
+	__slots__ = ("left", "op", "right")
+	_fields = ("left", "op", "right",)
+	_child_fields = ("left", "op", "right")
 	def __init__(self, left: 'Expr', op: 'BinOp', right: 'Expr'):
-		self._fields = ("left", "op", "right",)
+		super().__init__()
 		self.left: 'Expr' = left
 		self.op: 'BinOp' = op
 		self.right: 'Expr' = right
 
 class BinaryCondExpr(Expr):
+	__slots__ = ("left", "op", "right")
+	_fields = ("left", "op", "right",)
+	_child_fields = ("left", "op", "right")
 	def __init__(self, left: 'Expr', op: 'BinCOp', right: 'Expr'):
-		self._fields = ("left", "op", "right",)
+		super().__init__()
 		self.left: 'Expr' = left
 		self.op: 'BinCOp' = op
 		self.right: 'Expr' = right
 
 class TernaryExpr(Expr):
+	__slots__ = ("cond_expr", "true_expr", "false_expr")
+	_fields = ("cond_expr", "true_expr", "false_expr",)
+	_child_fields = ("cond_expr", "true_expr", "false_expr")
 	def __init__(self, cond_expr: 'Expr', true_expr: 'Expr', false_expr: 'Expr'):
-		self._fields = ("cond_expr", "true_expr", "false_expr",)
+		super().__init__()
 		self.cond_expr: 'Expr' = cond_expr
 		self.true_expr: 'Expr' = true_expr
 		self.false_expr: 'Expr' = false_expr
 
 class AssignExpr(Expr):
+	__slots__ = ("lhs", "rhs", "op")
+	_fields = ("lhs", "rhs", "op",)
+	_child_fields = ("lhs", "rhs", "op")
 	def __init__(self, lhs: 'Expr', rhs: 'Expr', op: 'BinOp' | None):
-		self._fields = ("lhs", "rhs", "op",)
+		super().__init__()
 		self.lhs: 'Expr' = lhs
 		self.rhs: 'Expr' = rhs
 		self.op: 'BinOp' | None = op
 
 class CommaExpr(Expr):
+	__slots__ = ("exprs",)
+	_fields = ("exprs",)
+	_child_fields = ("exprs",)
 	def __init__(self, exprs: list['Expr']):
-		self._fields = ("exprs",)
+		super().__init__()
 		self.exprs: list['Expr'] = exprs
 
 class ComplexExpr(Expr):
+	__slots__ = ("type", "value")
+	_fields = ("type", "value",)
+	_child_fields = ("value",)
 	def __init__(self, type: str, value: 'any'):
-		self._fields = ("type", "value",)
+		super().__init__()
 		self.type: str = type
 		self.value: 'any' = value
 
 ## TYPE 'UnaryOp'
-class UnaryOp(AST): pass
+class UnaryOp(AST):
+	__slots__ = ()
 
-class UnaryPlus(UnaryOp): pass
+class UnaryPlus(UnaryOp):
+	__slots__ = ()
 
-class UnaryMinus(UnaryOp): pass
+class UnaryMinus(UnaryOp):
+	__slots__ = ()
 
-class BitNot(UnaryOp): pass
+class BitNot(UnaryOp):
+	__slots__ = ()
 
 ## TYPE 'UnaryCOp'
-class UnaryCOp(AST): pass
+class UnaryCOp(AST):
+	__slots__ = ()
 
-class LogicalNot(UnaryCOp): pass
+class LogicalNot(UnaryCOp):
+	__slots__ = ()
 
 ## TYPE 'BinOp'
-class BinOp(AST): pass
+class BinOp(AST):
+	__slots__ = ()
 
-class Add(BinOp): pass
+class Add(BinOp):
+	__slots__ = ()
 
-class Sub(BinOp): pass
+class Sub(BinOp):
+	__slots__ = ()
 
-class Mult(BinOp): pass
+class Mult(BinOp):
+	__slots__ = ()
 
-class UDiv(BinOp): pass
+class UDiv(BinOp):
+	__slots__ = ()
 
-class SDiv(BinOp): pass
+class SDiv(BinOp):
+	__slots__ = ()
 
-class UMod(BinOp): pass
+class UMod(BinOp):
+	__slots__ = ()
 
-class SMod(BinOp): pass
+class SMod(BinOp):
+	__slots__ = ()
 
-class ShLogLeft(BinOp): pass
+class ShLogLeft(BinOp):
+	__slots__ = ()
 
-class ShLogRight(BinOp): pass
+class ShLogRight(BinOp):
+	__slots__ = ()
 
-class ShArRight(BinOp): pass
+class ShArRight(BinOp):
+	__slots__ = ()
 
-class BitAnd(BinOp): pass
+class BitAnd(BinOp):
+	__slots__ = ()
 
-class BitXor(BinOp): pass
+class BitXor(BinOp):
+	__slots__ = ()
 
-class BitOr(BinOp): pass
+class BitOr(BinOp):
+	__slots__ = ()
 
 ## TYPE 'BinCOp'
-class BinCOp(AST): pass
+class BinCOp(AST):
+	__slots__ = ()
 
-class LogicalAnd(BinCOp): pass
+class LogicalAnd(BinCOp):
+	__slots__ = ()
 
-class LogicalOr(BinCOp): pass
+class LogicalOr(BinCOp):
+	__slots__ = ()
 
-class Eq(BinCOp): pass
+class Eq(BinCOp):
+	__slots__ = ()
 
-class NotEq(BinCOp): pass
+class NotEq(BinCOp):
+	__slots__ = ()
 
-class ULt(BinCOp): pass
+class ULt(BinCOp):
+	__slots__ = ()
 
-class ULtE(BinCOp): pass
+class ULtE(BinCOp):
+	__slots__ = ()
 
-class SLt(BinCOp): pass
+class SLt(BinCOp):
+	__slots__ = ()
 
-class SLtE(BinCOp): pass
+class SLtE(BinCOp):
+	__slots__ = ()
 
-class UGt(BinCOp): pass
+class UGt(BinCOp):
+	__slots__ = ()
 
-class UGtE(BinCOp): pass
+class UGtE(BinCOp):
+	__slots__ = ()
 
-class SGt(BinCOp): pass
+class SGt(BinCOp):
+	__slots__ = ()
 
-class SGtE(BinCOp): pass
\ No newline at end of file
+class SGtE(BinCOp):
+	__slots__ = ()
\ No newline at end of file
@@ -1,4 +1,6 @@
 from __future__ import annotations
+import sys
+from collections import deque
 import internals.astnodes as ast
 import internals.nssymtab as nssym
 import internals.nsstbuilder as nsst
@@ -11,11 +13,40 @@ Module responsible for translating the higher-level AST-tree into asmnodes and t
 """
 
 def to_assembly(gen: 'Generator') -> list[str]:
-    lines = []
-    for stmt in gen.assembly:
-        lines.append(str(stmt))
-    
-    return lines
+    return [str(stmt) for stmt in gen.assembly]
+
+def iter_assembly_lines(gen: 'Generator'):
+    "Yields rendered assembly lines one at a time, for writers that stream to disk."
+    return map(str, gen.assembly)
+
+# Shared operands for the function prologue/epilogue; register operands are immutable.
+_REG_V32 = asm.register("V", is32bit=True)
+_REG_P32 = asm.register("P", is32bit=True)
+_REG_E32 = asm.register("E", is32bit=True)
+_REG_P = asm.register("P")
+
+# Handlers for get_min_size_on_stack, keyed by exact statement type.
+def _stack_def(stmt: ast.DefStmt, vars: list, compounds: list):
+    decl = stmt.decl
+    if isinstance(decl, ast.VarDecl) and not decl.is_static:
+        vars.append(decl)
+
+def _stack_compound(stmt: ast.CompoundStmt, vars: list, compounds: list):
+    compounds.append(stmt)
+
+def _stack_if(stmt: ast.IfStmt, vars: list, compounds: list):
+    compounds.append(stmt.body)
+
+def _stack_iter(stmt: ast.IterStmt, vars: list, compounds: list):
+    compounds.append(stmt.body)
+    if stmt.else_body != None: compounds.append(stmt.else_body)
+
+_STACK_HANDLERS = {
+    ast.DefStmt: _stack_def,
+    ast.CompoundStmt: _stack_compound,
+    ast.IfStmt: _stack_if,
+    ast.IterStmt: _stack_iter,
+}
 
 class FunctionContext:
     def __init__(self, func: ast.FuncDecl):
@@ -25,96 +56,116 @@ class FunctionContext:
 class Generator(ast.NodeVisitor):
     L_UNKNOWN = 1
     
-    def __init__(self):
+    def __init__(self, out=None):
         self.scope: nssym.SymbolTable = nsst.GetSymbolTable()
         self.logger = nslog.LoggerFactory.getLogger()
         self.success = True
         
-        self.assembly: list[asm.Statement] = list()
+        # When `out` is a writable text stream, statements are rendered and
+        # written as they are produced instead of being buffered in `assembly`.
+        self.out = out
+        
+        # deque appends never trigger the geometric copy a large list would
+        self.assembly: deque[asm.Statement] = deque()
         self.strings: dict[str, list[int]] = dict()
+        self._string_labels: dict[bytes, str] = dict() # content -> label, for literal dedup
         
         self.locals_assigned = 0
-        self.idmap: dict[int, nssym.SymbolTable] = dict()
-        self.namemap: dict[int, str] = dict()
+        self.idmap: dict[nssym.Symbol, nssym.SymbolTable] = dict()
+        self.namemap: dict[nssym.Symbol, str] = dict()
+        self._used_names: set[str] = set() # Every name ever handed out or registered in namemap
+        self._tsize_cache: dict[tuple[int, int, bool], int] = dict()
+        self._stack_size_cache: dict[int, int] = dict()
         
         self.current_context: 'FunctionContext' | None = None
     
     def _get_lname(self, prefix="L") -> str:
-        while (name := prefix + str(self.locals_assigned)) in self.namemap.values():
+        while (name := prefix + str(self.locals_assigned)) in self._used_names:
             self.locals_assigned += 1
         self.locals_assigned += 1
+        name = sys.intern(name)
+        self._used_names.add(name)
         return name
     
     def _get_lcname(self) -> str:
-        return self._get_lcname(prefix="LC")
+        return self._get_lname(prefix="LC")
     
-    def get_children_of_types(self, node: ast.AST, nodeType: any | tuple[any], recursive: bool = False) -> list[ast.AST]:
-        "Walks the descendants or direct children of the specified node and returns all nodes with the corresponding type."
-        func = ast.walk if recursive else ast.iter_child_nodes
-        
-        children: list[ast.AST] = []
-        
-        for node in func(node):
-            if isinstance(node, nodeType):
-                children.append(node)
-        
-        return children
+    def add_string(self, content: list[int]) -> str:
+        "Registers a string literal and returns its label; identical literals share one label."
+        key = bytes(content)
+        label = self._string_labels.get(key)
+        if label is None:
+            label = self._string_labels[key] = self._get_lcname()
+            self.strings[label] = content
+        return label
     
     def get_variables(self, node: ast.AST, recursive: bool = False) -> list[ast.VarDecl]:
         "Walks the direct children of the specified node and returns all variables corresponding to their VarDecl in the symbol table."
-        nodes: list[ast.VarDecl] = self.get_children_of_types(node, ast.VarDecl, recursive=False)
-        
-        nodes = list(filter(
-            lambda x: self.scope.get_namesym(x.name) is x.symref,
-            nodes
-        ))
-        
-        return nodes
+        get_namesym = self.scope.get_namesym
+        return [n for n in ast.iter_child_nodes(node)
+                if isinstance(n, ast.VarDecl) and get_namesym(n.name) is n.symref]
     
     def get_functions(self, node: ast.AST, recursive: bool = False) -> list[ast.FuncDecl]:
         "Walks the direct children of the specified node and returns all functions corresponding to their FuncDecl in the symbol table."
-        nodes: list[ast.FuncDecl] = self.get_children_of_types(node, ast.FuncDecl, recursive=False)
-        
-        nodes = list(filter(
-            lambda x: self.scope.get_namesym(x.name) is x.symref,
-            nodes
-        ))
-        
-        return nodes
+        get_namesym = self.scope.get_namesym
+        return [n for n in ast.iter_child_nodes(node)
+                if isinstance(n, ast.FuncDecl) and get_namesym(n.name) is n.symref]
     
     def get_min_size_on_stack(self, node: ast.AST) -> int:
         "Returns the minimum number of words needed on stack for local variables in the function."
         
         if not isinstance(node, ast.CompoundStmt): return 0
         
+        cached = self._stack_size_cache.get(id(node))
+        if cached is not None: return cached
+        
         vars: list[ast.VarDecl] = []
         compounds: list[ast.CompoundStmt] = []
         
         for stmt in node.stmts:
-            if isinstance(stmt, ast.DefStmt) and isinstance(stmt.decl, ast.VarDecl) and not stmt.decl.is_static:
-                vars.append(stmt.decl)
-            if isinstance(stmt, ast.CompoundStmt):
-                compounds.append(stmt)
-            if isinstance(stmt, ast.IfStmt):
-                compounds.append(stmt.body)
-            if isinstance(stmt, ast.IterStmt):
-                compounds.append(stmt.body)
-                if stmt.else_body != None: compounds.append(stmt.else_body)        
-        
-        size = 0
-        
-        for var in vars:
-            size += nseval.get_type_size(self.scope, var.type, eval_array=True)
-        
-        children_stmts = [0]
-        for compound in compounds:
-            children_stmts.append(self.get_min_size_on_stack(compound))
-        
-        return size + max(children_stmts)
+            handler = _STACK_HANDLERS.get(type(stmt))
+            if handler != None: handler(stmt, vars, compounds)
+        
+        tsize_cache = self._tsize_cache
+        def var_size(var: ast.VarDecl) -> int:
+            key = (id(self.scope), id(var.type), True)
+            tsize = tsize_cache.get(key)
+            if tsize is None:
+                tsize = tsize_cache[key] = nseval.get_type_size(self.scope, var.type, eval_array=True)
+            return tsize
+        
+        size = sum(map(var_size, vars)) \
+             + max(map(self.get_min_size_on_stack, compounds), default=0)
+        self._stack_size_cache[id(node)] = size
+        return size
+    
+    def _emit(self, stmt: asm.Statement) -> None:
+        "Appends a statement to the assembly buffer, or streams it to `self.out`."
+        if self.out is None:
+            self.assembly.append(stmt)
+        else:
+            self.out.write(str(stmt))
+    
+    def _emit_many(self, stmts: list[asm.Statement]) -> None:
+        "Bulk version of _emit."
+        if self.out is None:
+            self.assembly.extend(stmts)
+        else:
+            self.out.write("".join(map(str, stmts)))
+    
+    def _emit_symbol_directive(self, directive: str, decls: list[ast.Decl], syms: dict[str, nssym.Symbol]) -> None:
+        "Emits a symbol-listing directive (.global/.extern) for `decls` and registers their names."
+        if not decls: return
+        
+        stmt = asm.Directive(directive)
+        stmt.operands = [asm.label(decl.name) for decl in decls]
+        self.namemap.update((syms[decl.name], decl.name) for decl in decls)
+        self._used_names.update(decl.name for decl in decls)
+        self._emit(stmt)
     
     def include_file(self, filename: str) -> None:
         "Includes the specified file."
-        self.assembly.append(asm.PreprocDirective(f"#include \"{filename}\""))
+        self._emit(asm.PreprocDirective(f"#include \"{filename}\""))
     
     def visit_FuncDecl(self, node: ast.FuncDecl) -> ast.FuncDecl:
         # Will ignore inline nodes for now cuz im lazy
@@ -128,11 +179,14 @@ class Generator(ast.NodeVisitor):
         
         func_header = asm.Space()
         func_header.comment = "FUNC " + func_str
-        self.assembly.append(func_header)
+        self._emit(func_header)
         
         # Register the function name and create function context
-        name = self.namemap.get(id(self.scope.get_namesym(node.name))) or f"{self._get_lname()}@{node.name}"
-        self.namemap[id(self.scope.get_namesym(node.name))] = name
+        namemap = self.namemap
+        sym = self.scope.get_namesym(node.name)
+        name = namemap.get(sym) or f"{self._get_lname()}@{node.name}"
+        namemap[sym] = name
+        self._used_names.add(name)
         
         self.current_context = FunctionContext(node)
         self.current_context.exit_label = f"{self._get_lname()}@{node.name}.exit"
@@ -144,61 +198,40 @@ class Generator(ast.NodeVisitor):
         # TODO
         
         # Add function label
-        self.assembly.append(asm.LabelStatement(name))
+        self._emit(asm.LabelStatement(name))
         
         # Function setup
             # push callee-saved registers.
-        push_uv = asm.OpStatement("push")
-        push_uv.operands.append(asm.RegisterOperand("V", is32bit=True))
-        self.assembly.append(push_uv)
-        set_uv = asm.OpStatement("mov")
-        set_uv.operands.extend([
-            asm.RegisterOperand("V", is32bit=True),
-            asm.RegisterOperand("P", is32bit=True)])
-        self.assembly.append(set_uv)
-        push_eg = asm.OpStatement("push")
-        push_eg.operands.append(asm.RegisterOperand("E", is32bit=True))
-        self.assembly.append(push_eg)
-        del push_uv, set_uv, push_eg
+        self._emit_many([
+            asm.OpStatement("push", [_REG_V32]),
+            asm.OpStatement("mov", [_REG_V32, _REG_P32]),
+            asm.OpStatement("push", [_REG_E32])])
         
             # allocate stack space for local variables
         stack_words = self.get_min_size_on_stack(node.body)
         
         if stack_words > 0:
-            stackalloc = asm.OpStatement("add")
-            stackalloc.operands.append(asm.RegisterOperand("P"))
-            stackalloc.operands.append(asm.ImmOperand(stack_words))
-            self.assembly.append(stackalloc)
-            del stackalloc
+            self._emit(asm.OpStatement("add", [
+                _REG_P,
+                asm.ImmOperand(stack_words)]))
             
         # Code generation
         # Very much TODO
         
         # Create default return
-        self.assembly.append(asm.LabelStatement(self.current_context.exit_label))
-            # reset stack space
-        stackdealloc = asm.OpStatement("mov")
-        stackdealloc.operands.append(asm.RegisterOperand("P", is32bit=True))
-        stackdealloc.operands.append(asm.RegisterOperand("V", is32bit=True))
-        self.assembly.append(stackdealloc)
-        del stackdealloc
-        
-            # pop callee-saved registers.
-        pop_eg = asm.OpStatement("pop")
-        pop_eg.operands.append(asm.RegisterOperand("E", is32bit=True))
-        self.assembly.append(pop_eg)
-        pop_uv = asm.OpStatement("pop")
-        pop_uv.operands.append(asm.RegisterOperand("V", is32bit=True))
-        self.assembly.append(pop_uv)
-        
-            # add return statement
-        self.assembly.append(asm.OpStatement("ret"))
+        self._emit(asm.LabelStatement(self.current_context.exit_label))
+            # reset stack space, pop callee-saved registers, return.
+        self._emit_many([
+            asm.OpStatement("mov", [_REG_P32, _REG_V32]),
+            asm.OpStatement("pop", [_REG_E32]),
+            asm.OpStatement("pop", [_REG_V32]),
+            asm.OpStatement("ret")])
         
         # Add a footer string
         func_footer = asm.Space()
         func_footer.comment = "\tENDFUNC " + func_str
-        self.assembly.append(func_footer)
-        self.assembly.append(asm.Space())
+        self._emit(func_footer)
+        self._emit(asm.Space())
         
         self.current_context = None
         
@@ -207,80 +240,80 @@ class Generator(ast.NodeVisitor):
     def visit_Module(self, node: ast.Module) -> ast.Module:
         "Create the data and text sections, populate them."
         self.include_file("std\libns.s")
-        self.assembly.append(asm.Space())
-        
-        variables: list[ast.VarDecl] = self.get_variables(node)
-        constants: list[ast.ConstDecl] = self.get_children_of_types(node, ast.ConstDecl)
-        functions: list[ast.FuncDecl] = self.get_functions(node)
-        
-        global_vars = [x for x in variables if not x.is_static and x.value]
-        extern_vars = [x for x in variables if not x.is_static and not x.value]
-        global_funcs = [x for x in functions if not x.is_static and x.body]
-        extern_funcs = [x for x in functions if not x.is_static and not x.body]
-        
-        if len(global_vars) > 0:
-            glbl = asm.Directive(".global")
-            for global_var in global_vars:
-                label = asm.LabelOperand(global_var.name)
-                glbl.operands.append(label)
-                self.namemap[id(self.scope.get_namesym(global_var.name))] = global_var.name
-            self.assembly.append(glbl)
-        
-        if len(global_funcs) > 0:
-            glbl = asm.Directive(".global")
-            for global_func in global_funcs:
-                label = asm.LabelOperand(global_func.name)
-                glbl.operands.append(label)
-                self.namemap[id(self.scope.get_namesym(global_func.name))] = global_func.name
-            self.assembly.append(glbl)
-        
-        if len(extern_vars) > 0:
-            extern = asm.Directive(".extern")
-            for extern_var in extern_vars:
-                label = asm.LabelOperand(extern_var.name)
-                extern.operands.append(label)
-                self.namemap[id(self.scope.get_namesym(extern_var.name))] = extern_var.name
-            self.assembly.append(extern)
-        
-        if len(extern_funcs) > 0:
-            extern = asm.Directive(".extern")
-            for extern_func in extern_funcs:
-                label = asm.LabelOperand(extern_func.name)
-                extern.operands.append(label)
-                self.namemap[id(self.scope.get_namesym(extern_func.name))] = extern_func.name
-            self.assembly.append(extern)
-        
-        self.assembly.append(asm.Space())
+        self._emit(asm.Space())
+        
+        # Classify the module-level decls in a single pass.
+        constants: list[ast.ConstDecl] = []
+        global_vars: list[ast.VarDecl] = []
+        extern_vars: list[ast.VarDecl] = []
+        intern_vars: list[ast.VarDecl] = [] # everything but the externs, in decl order
+        global_funcs: list[ast.FuncDecl] = []
+        extern_funcs: list[ast.FuncDecl] = []
+        intern_funcs: list[ast.FuncDecl] = []
+        syms: dict[str, nssym.Symbol] = {} # get_namesym cache, reused for namemap below
+        get_namesym = self.scope.get_namesym
+        
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ConstDecl):
+                constants.append(child)
+            elif isinstance(child, ast.VarDecl):
+                sym = syms.setdefault(child.name, get_namesym(child.name))
+                if sym is not child.symref: continue
+                if child.is_static:
+                    intern_vars.append(child)
+                elif child.value:
+                    global_vars.append(child)
+                    intern_vars.append(child)
+                else:
+                    extern_vars.append(child)
+            elif isinstance(child, ast.FuncDecl):
+                sym = syms.setdefault(child.name, get_namesym(child.name))
+                if sym is not child.symref: continue
+                if child.is_static:
+                    intern_funcs.append(child)
+                elif child.body:
+                    global_funcs.append(child)
+                    intern_funcs.append(child)
+                else:
+                    extern_funcs.append(child)
+        
+        self._emit_symbol_directive(".global", global_vars, syms)
+        
+        self._emit_symbol_directive(".global", global_funcs, syms)
+        
+        self._emit_symbol_directive(".extern", extern_vars, syms)
+        
+        self._emit_symbol_directive(".extern", extern_funcs, syms)
+        
+        self._emit(asm.Space())
         
         # generate data
-        self.assembly.append(asm.Directive(".data"))
+        self._emit(asm.Directive(".data"))
         
         # constants
         for constant in constants:
             self.visit(constant)
-        self.assembly.append(asm.Space())
+        self._emit(asm.Space())
         
         # variables
-        for variable in variables:
-            if variable in extern_vars: continue
+        for variable in intern_vars:
             self.visit(variable)
-        self.assembly.append(asm.Space())
+        self._emit(asm.Space())
         
         # generate code
-        self.assembly.append(asm.Directive(".text"))
-        for function in functions:
-            if function in extern_funcs: continue
+        self._emit(asm.Directive(".text"))
+        for function in intern_funcs:
             self.visit(function)
             
         if len(self.strings) != 0:
             section_dir = asm.Directive(".section")
             section_dir.operands.extend([
-                asm.LabelOperand("strings")
+                asm.label("strings")
             ])
-            self.assembly.append(section_dir)
+            self._emit(section_dir)
             
             for name, string in self.strings.items():
-                self.assembly.append(asm.LabelStatement(name))
+                self._emit(asm.LabelStatement(name))
                 str_stmt = asm.Directive(".string")
                 str_stmt.operands.append(asm.StrOperand(string))
-                self.assembly.append(str_stmt)
\ No newline at end of file
+                self._emit(str_stmt)
\ No newline at end of file
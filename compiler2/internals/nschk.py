@@ -5,70 +5,176 @@ import internals.nsstbuilder as nsst
 import internals.nslog as nslog
 import internals.nstypes as nstypes
 
-def GetExpressionType(scope: nssym.SymbolTable, expr: ast.Expr) -> ast.Type:
-    "Returns the type of an expression. The nodes must have been semantically checked, otherwise behaviour is undefined."
-    if isinstance(expr, ast.NameExpr): return nsst.ExpandType(scope, scope.get_namesym(expr.name).get_type())
-    if isinstance(expr, ast.IntExpr): return expr.type
-    if isinstance(expr, ast.StrExpr): return ast.ArrayType(
+# Hoisted operand-class tuples; rebuilt tuples and repeated mro walks add up
+# on the per-node paths. The Type hierarchy is flat, so exact-type membership
+# in the frozenset is equivalent to isinstance on the tuple.
+_COND_OK = (ast.IntType, ast.ArrayType, ast.FuncType)
+_COND_OK_SET = frozenset(_COND_OK)
+_ARR_FUNC = (ast.ArrayType, ast.FuncType)
+_RECORD_TYPES = (ast.StructType, ast.UnionType)
+
+_UNCACHED = object() # Cache-miss sentinel; False/None are valid cached values
+
+# Local alias; CFG attributes are class-level constants, so one LOAD_GLOBAL
+# beats the nstypes.CFG.INT_SIZES attribute chain on the binary-op path.
+_INT_SIZES = nstypes.CFG.INT_SIZES
+
+def _pos(node: ast.AST) -> tuple[int, int]:
+    "Source position of a node, for error/diagnostic messages only."
+    return (node.lineno, node.col_offset)
+
+def _end_pos(node: ast.AST) -> tuple[int, int]:
+    "End source position of a node, for error/diagnostic messages only."
+    return (node.end_lineno, node.end_col_offset)
+
+def _get_member(rec_type: ast.StructType | ast.UnionType, name: str) -> ast.MemberData | None:
+    "Looks up a record member by name, building the record's name index on first use."
+    index = rec_type._member_index
+    if index is None:
+        index = rec_type._member_index = {m.name: m for m in rec_type.members}
+    return index.get(name)
+
+def GetExpressionType(scope: nssym.SymbolTable, expr: ast.Expr, cache: dict[int, ast.Type] | None = None) -> ast.Type:
+    """Returns the type of an expression. The nodes must have been semantically checked, otherwise behaviour is undefined.
+
+    If `cache` is given, results are memoized in it by expression identity so
+    repeated queries over the same subtree are answered in O(1)."""
+    if cache is None:
+        return _ComputeExpressionType(scope, expr, cache)
+    etype = cache.get(id(expr))
+    if etype is None:
+        etype = cache[id(expr)] = _ComputeExpressionType(scope, expr, cache)
+    return etype
+
+# Per-class handlers for _ComputeExpressionType, dispatched on type(expr).
+def _etype_name(scope, expr, cache): return nsst.ExpandType(scope, scope.get_namesym(expr.name).get_type())
+
+def _etype_int(scope, expr, cache): return expr.type
+
+def _etype_str(scope, expr, cache):
+    return ast.ArrayType(
         is_volatile=False,
         inner_type=ast.IntType(is_volatile=False, type="int"),
         size=ast.IntExpr(
             type=ast.IntType(is_volatile=False, type="int"),
             value=len(expr.utf8)))
-    if isinstance(expr, ast.SzexprExpr): return ast.IntType(is_volatile=False, type="long")
-    if isinstance(expr, ast.SztypeExpr): return ast.IntType(is_volatile=False, type="long")
-    if isinstance(expr, ast.CallExpr): return nsst.ExpandType(scope, nsst.ExpandType(scope, GetExpressionType(scope, expr.func_expr)).return_type)
-    if isinstance(expr, ast.IndexExpr): return nsst.ExpandType(scope, nsst.ExpandType(scope, GetExpressionType(scope, expr.array_expr)).inner_type)
-    if isinstance(expr, ast.AccessExpr):
-        for member in nsst.ExpandType(scope, GetExpressionType(scope, expr.record_expr)).members:
-            if member.name == expr.member_name: return nsst.ExpandType(scope, member.type)
-        raise Exception() # This should never be reached if checking was successful
-    if isinstance(expr, ast.CastExpr): return nsst.ExpandType(scope, expr.cast_type)
-    if isinstance(expr, ast.DerefExpr): return nsst.ExpandType(scope, nsst.ExpandType(scope, GetExpressionType(scope, expr.pointer_expr)).inner_type)
-    if isinstance(expr, ast.AddrOfExpr): return ast.ArrayType(
+
+def _etype_szexpr(scope, expr, cache): return ast.IntType(is_volatile=False, type="long")
+
+def _expanded_attr(scope, expr_node, attr, cache):
+    """Types `expr_node` and returns the expanded `attr` component of the result.
+
+    GetExpressionType already hands back expanded types, so the old
+    intermediate ExpandType call around it was a no-op and is dropped."""
+    return nsst.ExpandType(scope, getattr(GetExpressionType(scope, expr_node, cache), attr))
+
+def _etype_call(scope, expr, cache):
+    return _expanded_attr(scope, expr.func_expr, "return_type", cache)
+
+def _etype_index(scope, expr, cache):
+    return _expanded_attr(scope, expr.array_expr, "inner_type", cache)
+
+def _etype_access(scope, expr, cache):
+    member = _get_member(nsst.ExpandType(scope, GetExpressionType(scope, expr.record_expr, cache)), expr.member_name)
+    if member is not None: return nsst.ExpandType(scope, member.type)
+    raise Exception() # This should never be reached if checking was successful
+
+def _etype_cast(scope, expr, cache): return nsst.ExpandType(scope, expr.cast_type)
+
+def _etype_deref(scope, expr, cache):
+    return _expanded_attr(scope, expr.pointer_expr, "inner_type", cache)
+
+def _etype_addrof(scope, expr, cache):
+    return ast.ArrayType(
         is_volatile=False,
-        inner_type=nsst.ExpandType(scope, GetExpressionType(scope, expr.expr)),
+        inner_type=nsst.ExpandType(scope, GetExpressionType(scope, expr.expr, cache)),
         size=False)
-    if isinstance(expr, ast.UnaryExpr): return nsst.ExpandType(scope, GetExpressionType(scope, expr.expr))
-    if isinstance(expr, ast.UnaryCondExpr): return ast.IntType(is_volatile=False, type="int")
-    if isinstance(expr, ast.BinaryExpr): return nsst.ExpandType(scope, GetExpressionType(scope, expr.left))
-    if isinstance(expr, ast.BinaryCondExpr): return ast.IntType(is_volatile=False, type="int")
-    if isinstance(expr, ast.TernaryExpr): return nsst.ExpandType(scope, GetExpressionType(scope, expr.true_expr))
-    if isinstance(expr, ast.AssignExpr): return nsst.ExpandType(scope, GetExpressionType(scope, expr.lhs))
-    if isinstance(expr, ast.CommaExpr): return nsst.ExpandType(scope, GetExpressionType(scope, expr.exprs[-1]))
-    if isinstance(expr, ast.ComplexExpr):
-        if expr.type in ("str", "array"):
-            return ast.ArrayType(
-                is_volatile=False,
-                inner_type=nsst.ExpandType(scope, GetExpressionType(scope, expr.value[0])),
-                size=ast.IntExpr(
-                    type=ast.IntType(is_volatile=False, type="long"),
-                    value=len(expr.value)))
-        if expr.type == "struct": return ast.StructType(
+
+def _etype_unary(scope, expr, cache): return nsst.ExpandType(scope, GetExpressionType(scope, expr.expr, cache))
+
+def _etype_intcond(scope, expr, cache): return ast.IntType(is_volatile=False, type="int")
+
+def _etype_binary(scope, expr, cache): return nsst.ExpandType(scope, GetExpressionType(scope, expr.left, cache))
+
+def _etype_ternary(scope, expr, cache): return nsst.ExpandType(scope, GetExpressionType(scope, expr.true_expr, cache))
+
+def _etype_assign(scope, expr, cache): return nsst.ExpandType(scope, GetExpressionType(scope, expr.lhs, cache))
+
+def _etype_comma(scope, expr, cache): return nsst.ExpandType(scope, GetExpressionType(scope, expr.exprs[-1], cache))
+
+def _etype_complex(scope, expr, cache):
+    if expr.type in ("str", "array"):
+        return ast.ArrayType(
             is_volatile=False,
-            members=[
-                ast.MemberData(name=name, type=nsst.ExpandType(scope, GetExpressionType(scope, value)), bits=-1) # -1 indicates a complex expression which is special.
-                for name, value in expr.value.items()])
+            inner_type=nsst.ExpandType(scope, GetExpressionType(scope, expr.value[0], cache)),
+            size=ast.IntExpr(
+                type=ast.IntType(is_volatile=False, type="long"),
+                value=len(expr.value)))
+    if expr.type == "struct": return ast.StructType(
+        is_volatile=False,
+        members=[
+            ast.MemberData(name=name, type=nsst.ExpandType(scope, GetExpressionType(scope, value, cache)), bits=-1) # -1 indicates a complex expression which is special.
+            for name, value in expr.value.items()])
+    raise Exception()
+
+_TYPE_HANDLERS: dict[type, any] = {
+    ast.NameExpr: _etype_name,
+    ast.IntExpr: _etype_int,
+    ast.StrExpr: _etype_str,
+    ast.SzexprExpr: _etype_szexpr,
+    ast.SztypeExpr: _etype_szexpr,
+    ast.CallExpr: _etype_call,
+    ast.IndexExpr: _etype_index,
+    ast.AccessExpr: _etype_access,
+    ast.CastExpr: _etype_cast,
+    ast.DerefExpr: _etype_deref,
+    ast.AddrOfExpr: _etype_addrof,
+    ast.UnaryExpr: _etype_unary,
+    ast.UnaryCondExpr: _etype_intcond,
+    ast.BinaryExpr: _etype_binary,
+    ast.BinaryCondExpr: _etype_intcond,
+    ast.TernaryExpr: _etype_ternary,
+    ast.AssignExpr: _etype_assign,
+    ast.CommaExpr: _etype_comma,
+    ast.ComplexExpr: _etype_complex,
+}
+
+def _ComputeExpressionType(scope: nssym.SymbolTable, expr: ast.Expr, cache: dict[int, ast.Type] | None) -> ast.Type:
+    handler = _TYPE_HANDLERS.get(type(expr))
+    if handler is not None: return handler(scope, expr, cache)
     raise Exception()
 
+# CanCastTypes verdicts, precomputed for every (from, to) Type class pair.
+# Class objects already serve as identity tags, so the matrix is keyed on them
+# directly instead of assigning separate int tags.
+_CAST_OK, _CAST_EQUIV, _CAST_BAD_MIX, _CAST_BAD_CLASS = range(4)
+
+_TYPE_CLASSES = (ast.VoidType, ast.IntType, ast.ArrayType, ast.FuncType, ast.StructType, ast.UnionType, ast.RefType)
+
+def _cast_verdict(ft: type, tt: type) -> int:
+    if tt in _COND_OK_SET:
+        return _CAST_OK if ft in _COND_OK_SET else _CAST_BAD_MIX
+    if ft is not tt: return _CAST_BAD_CLASS
+    return _CAST_EQUIV
+
+_CAST_MATRIX: dict[tuple[type, type], int] = {
+    (ft, tt): _cast_verdict(ft, tt) for ft in _TYPE_CLASSES for tt in _TYPE_CLASSES}
+
 def CanCastTypes(scope: nssym.SymbolTable, from_type: ast.Type, to_type: ast.Type) -> None | str:
     "Check if two types are compatible. Returns None if successful or an error string otherwise."
-    is_valid = False
-    
-    if isinstance(to_type, (ast.IntType, ast.ArrayType, ast.FuncType)):
-        if not isinstance(from_type, (ast.IntType, ast.ArrayType, ast.FuncType)):
-            return "integers, arrays, pointers, and functions can only be casted to each other."
-        is_valid = True
-    
-    if not is_valid:
-        if not isinstance(from_type, to_type.__class__):
-            return "inner type and cast type are not of the same type."
-        if not nsst.CompareTypesEquiv(scope, from_type, to_type):
-            return "inner type and cast type are not equivalent."
-    
-    return None
+    verdict = _CAST_MATRIX.get((type(from_type), type(to_type)))
+    
+    if verdict == _CAST_OK: return None
+    if verdict == _CAST_EQUIV:
+        if nsst.CompareTypesEquiv(scope, from_type, to_type): return None
+        return "inner type and cast type are not equivalent."
+    if verdict == _CAST_BAD_CLASS:
+        return "inner type and cast type are not of the same type."
+    return "integers, arrays, pointers, and functions can only be casted to each other."
 
 class ExprProperty:
+    __slots__ = ("_const", "_iscomplexconst", "_lvalue")
+    
     def __init__(self):
         self._const: bool = False
         self._iscomplexconst: bool = False
@@ -86,6 +192,13 @@ class ExprPropertyChecker(ast.NodeVisitor):
     "Return the properties of an expression."
     def __init__(self, scope: nssym.SymbolTable):
         self.scope = scope
+        self._cache: dict[int, ExprProperty] = dict() # results by id(node); a node's properties never change
+    
+    def visit(self, node: ast.AST) -> ExprProperty:
+        prop = self._cache.get(id(node))
+        if prop is None:
+            prop = self._cache[id(node)] = super().visit(node)
+        return prop
     
     _mapping: dict[ast.Expr, tuple[bool, bool]] = {
         ast.IntExpr: (True, False),
@@ -126,11 +239,8 @@ class ExprPropertyChecker(ast.NodeVisitor):
         prop.set_lvalue(False)
         return prop
     
-    def visit_UnaryCondExpr(self, node: ast.UnaryCondExpr) -> ExprProperty:
-        prop = ExprProperty()
-        prop.set_const(self.visit(node.expr).is_const())
-        prop.set_lvalue(False)
-        return prop
+    # UnaryCondExpr carries the same shape and property rules as UnaryExpr.
+    visit_UnaryCondExpr = visit_UnaryExpr
     
     def visit_BinaryExpr(self, node: ast.BinaryExpr) -> ExprProperty:
         prop = ExprProperty()
@@ -138,11 +248,8 @@ class ExprPropertyChecker(ast.NodeVisitor):
         prop.set_lvalue(False)
         return prop
     
-    def visit_BinaryCondExpr(self, node: ast.BinaryCondExpr) -> ExprProperty:
-        prop = ExprProperty()
-        prop.set_const(self.visit(node.left).is_const() and self.visit(node.right).is_const())
-        prop.set_lvalue(False)
-        return prop
+    # Likewise for BinaryCondExpr and BinaryExpr.
+    visit_BinaryCondExpr = visit_BinaryExpr
     
     def visit_TernaryExpr(self, node: ast.TernaryExpr) -> ExprProperty:
         prop = ExprProperty()
@@ -154,7 +261,7 @@ class ExprPropertyChecker(ast.NodeVisitor):
     
     def visit_CommaExpr(self, node: ast.CommaExpr) -> ExprProperty:
         prop = ExprProperty()
-        prop.set_const(False not in [self.visit(expr).is_const() for expr in node.exprs])
+        prop.set_const(all(self.visit(expr).is_const() for expr in node.exprs))
         prop.set_lvalue(self.visit(node.exprs[-1]).is_lvalue())
         return prop
     
@@ -179,6 +286,18 @@ class ExprPropertyChecker(ast.NodeVisitor):
         prop.set_cplxconst(is_cplxconst)
         return prop
 
+# Visitors that early-return in one of Checker's two passes, so dispatch can
+# route them straight to _noop for that pass instead of calling in and bouncing
+# off the typedef_check guard.
+_PASS2_ONLY = (
+    ast.IfStmt, ast.IterStmt, ast.ContinueStmt, ast.BreakStmt, ast.ReturnStmt,
+    ast.VarDecl, ast.ConstDecl,
+    ast.CallExpr, ast.IndexExpr, ast.AccessExpr, ast.CastExpr, ast.DerefExpr,
+    ast.AddrOfExpr, ast.UnaryExpr, ast.UnaryCondExpr, ast.BinaryExpr,
+    ast.BinaryCondExpr, ast.TernaryExpr, ast.AssignExpr, ast.ComplexExpr,
+)
+_PASS1_ONLY = (ast.TypeDecl, ast.RefType, ast.MemberData)
+
 class Checker(ast.NodeVisitor):
     L_UNKNOWN = 1
     L_TYPENOTEXIST = 10
@@ -198,12 +317,51 @@ class Checker(ast.NodeVisitor):
         self.logger = nslog.LoggerFactory.getLogger()
         self.success = True
         self.typedef_check = True
+        self._type_cache: dict[int, ast.Type] = dict() # GetExpressionType memo, keyed by id(expr)
+        self._expand_cache: dict[tuple[nssym.SymbolTable, ast.Type], ast.Type] = dict()
+        self._equiv_cache: dict[tuple[nssym.SymbolTable, ast.Type, ast.Type], bool] = dict()
+        self._epchk = ExprPropertyChecker(self.scope)
         self.typenames: list[str] = []
+        self._typenames_set: set[str] = set() # mirrors typenames for O(1) membership
+        self._acyclic_typesyms: set[nssym.TypeSymbol] = set() # typesyms already verified non-circular
         self.refpos: tuple[int, int] = (None,None)
         self.ret_type: ast.Type = None # Return type for current function
         self.last_if: ast.IfStmt | None = None
         self.last_iter: ast.IterStmt | None = None
     
+    def _noop(self, node: ast.AST) -> ast.AST:
+        "Stand-in dispatch target for visitors that are inert in the current pass."
+        return node
+    
+    def _typeof(self, expr: ast.Expr) -> ast.Type:
+        "GetExpressionType against the current scope, memoized through _type_cache."
+        return GetExpressionType(self.scope, expr, self._type_cache)
+    
+    def _expand(self, type: ast.Type) -> ast.Type:
+        "Memoized nsst.ExpandType for the current scope; keyed by identity so no invalidation is needed on scope changes."
+        key = (self.scope, type)
+        expanded = self._expand_cache.get(key)
+        if expanded is None:
+            expanded = self._expand_cache[key] = nsst.ExpandType(self.scope, type)
+        return expanded
+    
+    def _equiv(self, type1: ast.Type, type2: ast.Type) -> bool:
+        "Memoized nsst.CompareTypesEquiv; equivalence is symmetric, so pairs are keyed in a canonical order."
+        scope = self.scope
+        key = (scope, type1, type2) if id(type1) < id(type2) else (scope, type2, type1)
+        result = self._equiv_cache.get(key, _UNCACHED)
+        if result is _UNCACHED:
+            result = self._equiv_cache[key] = nsst.CompareTypesEquiv(scope, type1, type2)
+        return result
+    
+    def _properties(self, expr: ast.Expr) -> ExprProperty:
+        "Runs the shared ExprPropertyChecker over `expr`, resyncing it to the current scope first."
+        epchk = self._epchk
+        if epchk.scope is not self.scope:
+            epchk.scope = self.scope
+            epchk._cache.clear() # NameExpr properties are scope-dependent
+        return epchk.visit(expr)
+    
     def _fatal(self, code: int, error: str):
         "Throw a fatal error which marks semantic analysis as unsuccessful and aborts."
         self.logger.fatal(f"{{C{code:02}}} {error}")
@@ -214,13 +372,24 @@ class Checker(ast.NodeVisitor):
         "Check typedecls first"
         self.logger.debug("first pass, checking types")
         self.logger.increasepad()
-        super().generic_visit(modl)
+        # Seed dispatch so second-pass-only visitors short-circuit without
+        # even entering their methods; the in-method guards stay as a backstop.
+        noop = self._noop
+        self._dispatch = {cls: noop for cls in _PASS2_ONLY}
+        # Only typedecls matter in pass one, but FuncDecls must still be
+        # entered since their bodies may declare local types.
+        visit = self.visit
+        for decl in modl.decls:
+            if isinstance(decl, (ast.TypeDecl, ast.FuncDecl)): visit(decl)
         self.logger.decreasepad()
         
         self.typedef_check = False
+        self._type_cache.clear()
+        self._dispatch = {cls: noop for cls in _PASS1_ONLY}
         self.logger.debug("second pass, checking everything else")
         self.logger.increasepad()
-        super().generic_visit(modl)
+        for decl in modl.decls:
+            if not isinstance(decl, ast.TypeDecl): visit(decl)
         self.logger.decreasepad()
         
         self.logger.debug("verifying global variables are constant")
@@ -234,46 +403,37 @@ class Checker(ast.NodeVisitor):
             
             if decl.value == None: continue
         
-            epchk = ExprPropertyChecker(self.scope)
-            props: ExprProperty = epchk.visit(decl.value)
+            props: ExprProperty = self._properties(decl.value)
         
             if not props.is_const() and not props.is_cplxconst():
-                self._fatal(Checker.L_TYPE_MISMATCH, f"{decl.value.lineno, decl.value.col_offset} global VarDecl initial expression must be constant.")
+                self._fatal(Checker.L_TYPE_MISMATCH, f"{_pos(decl.value)} global VarDecl initial expression must be constant.")
         
         self.logger.decreasepad()
     
     # Manage statements
-    def visit_IfStmt(self, istmt: ast.IfStmt) -> ast.AST:
-        "Check that the condition expression is integral, array, pointer, or function."
+    def _check_cond_stmt(self, istmt: ast.IfStmt | ast.IterStmt, attr: str, name: str) -> ast.AST:
+        "Shared body of visit_IfStmt/visit_IterStmt: track the enclosing statement and check the condition expression."
         if self.typedef_check: return istmt
         
-        last_if = self.last_if
-        self.last_if = istmt
+        previous = getattr(self, attr)
+        setattr(self, attr, istmt)
         super().generic_visit(istmt)
-        self.last_if = last_if
+        setattr(self, attr, previous)
         
-        cond_expr_type = GetExpressionType(self.scope, istmt.cond_expr)
+        cond_expr_type = self._typeof(istmt.cond_expr)
         
-        if not isinstance(cond_expr_type, (ast.IntType, ast.ArrayType, ast.FuncType)):
-            self._fatal(self.L_TYPE_MISMATCH, f"{istmt.lineno, istmt.col_offset} IfStmt expects an integer, array, pointer, or function as conditional expression, got {cond_expr_type.__class__.__name__}")
+        if type(cond_expr_type) not in _COND_OK_SET:
+            self._fatal(self.L_TYPE_MISMATCH, f"{_pos(istmt)} {name} expects an integer, array, pointer, or function as conditional expression, got {cond_expr_type.__class__.__name__}")
 
         return istmt
     
+    def visit_IfStmt(self, istmt: ast.IfStmt) -> ast.AST:
+        "Check that the condition expression is integral, array, pointer, or function."
+        return self._check_cond_stmt(istmt, "last_if", "IfStmt")
+    
     def visit_IterStmt(self, istmt: ast.IterStmt) -> ast.AST:
         "Check that the condition expression is integral, array, pointer, or function."
-        if self.typedef_check: return istmt
-        
-        last_iter = self.last_iter
-        self.last_iter = istmt
-        super().generic_visit(istmt)
-        self.last_iter = last_iter
-        
-        cond_expr_type = GetExpressionType(self.scope, istmt.cond_expr)
-        
-        if not isinstance(cond_expr_type, (ast.IntType, ast.ArrayType, ast.FuncType)):
-            self._fatal(self.L_TYPE_MISMATCH, f"{istmt.lineno, istmt.col_offset} IterStmt expects an integer, array, pointer, or function as conditional expression, got {cond_expr_type.__class__.__name__}")
-
-        return istmt
+        return self._check_cond_stmt(istmt, "last_iter", "IterStmt")
     
     def visit_ContinueStmt(self, cstmt: ast.ContinueStmt) -> ast.AST:
         "Check that if there is a label, it points to a loop."
@@ -284,14 +444,14 @@ class Checker(ast.NodeVisitor):
         if cstmt.label != None:
             labelsym = self.scope.get_labelsym(cstmt.label)
             if labelsym == None:
-                self._fatal(Checker.L_LABEL_NOT_EXIST, f"{cstmt.lineno, cstmt.col_offset} cannot find label '{cstmt.label}' in symbol table.")
+                self._fatal(Checker.L_LABEL_NOT_EXIST, f"{_pos(cstmt)} cannot find label '{cstmt.label}' in symbol table.")
             if not isinstance(labelsym.get_node(), ast.IterStmt):
-                self._fatal(Checker.L_LABEL_WRONG_TYPE, f"{cstmt.lineno, cstmt.col_offset} ContinueStmt got label '{cstmt.label}' for non-IterStmt block at {labelsym.get_node().lineno, labelsym.get_node().col_offset}.")
+                self._fatal(Checker.L_LABEL_WRONG_TYPE, f"{_pos(cstmt)} ContinueStmt got label '{cstmt.label}' for non-IterStmt block at {_pos(labelsym.get_node())}.")
             labelsym._reference()
             cstmt.symref = labelsym.get_node()
         else:
             if not self.last_iter:
-                self._fatal(Checker.L_NOT_IN_IF_ITER, f"{cstmt.lineno, cstmt.col_offset} ContinueStmt not in IterStmt")
+                self._fatal(Checker.L_NOT_IN_IF_ITER, f"{_pos(cstmt)} ContinueStmt not in IterStmt")
 
             cstmt.symref = self.last_iter
         
@@ -309,17 +469,17 @@ class Checker(ast.NodeVisitor):
         if bstmt.label != None:
             labelsym = self.scope.get_labelsym(bstmt.label)
             if labelsym == None:
-                self._fatal(Checker.L_LABEL_NOT_EXIST, f"{bstmt.lineno, bstmt.col_offset} cannot find label '{bstmt.label}' in symbol table.")
+                self._fatal(Checker.L_LABEL_NOT_EXIST, f"{_pos(bstmt)} cannot find label '{bstmt.label}' in symbol table.")
             
             if not isinstance(labelsym.get_node(), t):
-                self._fatal(Checker.L_LABEL_WRONG_TYPE, f"{bstmt.lineno, bstmt.col_offset} {t.__name__}-type BreakStmt got label '{bstmt.label}' for non-{t.__name__} block at {labelsym.get_node().lineno, labelsym.get_node().col_offset}.")
+                self._fatal(Checker.L_LABEL_WRONG_TYPE, f"{_pos(bstmt)} {t.__name__}-type BreakStmt got label '{bstmt.label}' for non-{t.__name__} block at {_pos(labelsym.get_node())}.")
             labelsym._reference()
             bstmt.symref = labelsym.get_node()
         else:
             last_check = self.last_if if bstmt.breakif else self.last_iter
             
             if not last_check or not isinstance(last_check, t):
-                self._fatal(Checker.L_NOT_IN_IF_ITER, f"{bstmt.lineno, bstmt.col_offset} {t.__name__}-type BreakStmt not in {t.__name__}.")
+                self._fatal(Checker.L_NOT_IN_IF_ITER, f"{_pos(bstmt)} {t.__name__}-type BreakStmt not in {t.__name__}.")
         
             bstmt.symref = last_check
         
@@ -333,34 +493,37 @@ class Checker(ast.NodeVisitor):
         
         if isinstance(self.ret_type, ast.VoidType):
             if rstmt.ret_expr != None:
-                self._fatal(Checker.L_TYPE_MISMATCH, f"{rstmt.lineno, rstmt.col_offset} enclosing function returns 'void', but ReturnStmt returns expression.")
+                self._fatal(Checker.L_TYPE_MISMATCH, f"{_pos(rstmt)} enclosing function returns 'void', but ReturnStmt returns expression.")
         else:
             if rstmt.ret_expr == None:
-                self._fatal(Checker.L_TYPE_MISMATCH, f"{rstmt.lineno, rstmt.col_offset} enclosing function returns '{self.ret_type.__class__.__name__}', but ReturnStmt does not return an expression.")
-            ret_expr_type = GetExpressionType(self.scope, rstmt.ret_expr)
-            if not nsst.CompareTypesEquiv(self.scope, self.ret_type, ret_expr_type):
-                self._fatal(Checker.L_TYPE_MISMATCH, f"{rstmt.lineno, rstmt.col_offset} function expects a return value of type '{self.ret_type.__class__.__name__}', got different '{ret_expr_type.__class__.__name__}'.")
+                self._fatal(Checker.L_TYPE_MISMATCH, f"{_pos(rstmt)} enclosing function returns '{self.ret_type.__class__.__name__}', but ReturnStmt does not return an expression.")
+            ret_expr_type = self._typeof(rstmt.ret_expr)
+            if not self._equiv(self.ret_type, ret_expr_type):
+                self._fatal(Checker.L_TYPE_MISMATCH, f"{_pos(rstmt)} function expects a return value of type '{self.ret_type.__class__.__name__}', got different '{ret_expr_type.__class__.__name__}'.")
         
         return rstmt
                 
     # Manage declarations
-    def __check_Decl(self, decl: ast.VarDecl | ast.ConstDecl) -> ast.AST:
-        "Check that the declared type and init expression type match."        
-        if decl.value == None: return decl
+    def __check_Decl(self, decl: ast.VarDecl | ast.ConstDecl) -> bool:
+        """Check that the declared type and init expression type match.
         
-        decl_type = nsst.ExpandType(self.scope, decl.type)
-        expr_type = GetExpressionType(self.scope, decl.value)
+        Returns True iff the declared type was given a new size and needs rechecking."""
+        if decl.value == None: return False
         
-        if not nsst.CompareTypesEquiv(self.scope, decl_type, expr_type):
-            self._fatal(Checker.L_TYPE_MISMATCH, f"{decl.lineno, decl.col_offset} declaration expected {decl_type.__class__.__name__}, got different {expr_type.__class__.__name__}.")
+        decl_type = self._expand(decl.type)
+        expr_type = self._typeof(decl.value)
+        
+        if not self._equiv(decl_type, expr_type):
+            self._fatal(Checker.L_TYPE_MISMATCH, f"{_pos(decl)} declaration expected {decl_type.__class__.__name__}, got different {expr_type.__class__.__name__}.")
         
         if isinstance(decl.value, ast.ComplexExpr) and decl.value.type != "struct" and decl_type.size == None:
             if isinstance(decl.type, ast.ArrayType):
                 decl.type.size = ast.IntExpr(
                     type=ast.IntType(is_volatile=False, type="long"),
                     value=len(decl.value.value))
+                return True
         
-        return decl
+        return False
     
     def visit_VarDecl(self, decl: ast.VarDecl) -> ast.AST:
         "Check that the type of the VarDecl and its init expression match."
@@ -369,14 +532,14 @@ class Checker(ast.NodeVisitor):
         super().generic_visit(decl)
         
         if self.ret_type != None and decl.value == None:
-            self._fatal(Checker.L_MISSING_VALUE, f"{decl.lineno, decl.col_offset} function-local variable declaration must have a value, none given.")
-        
-        self.__check_Decl(decl)
+            self._fatal(Checker.L_MISSING_VALUE, f"{_pos(decl)} function-local variable declaration must have a value, none given.")
         
-        # Recheck type in case it was an ArrayType with a new size value.
-        self.visit(decl.type)
+        if self.__check_Decl(decl):
+            # Recheck type and declaration only if a new ArrayType size was set.
+            self.visit(decl.type)
+            self.__check_Decl(decl)
         
-        return self.__check_Decl(decl)
+        return decl
             
     def visit_ConstDecl(self, decl: ast.ConstDecl) -> ast.AST:
         "Check that the type of the ConstDecl and its init expression match."
@@ -384,17 +547,17 @@ class Checker(ast.NodeVisitor):
         
         super().generic_visit(decl)
         
-        decl_type = nsst.ExpandType(self.scope, decl.type)
+        decl_type = self._expand(decl.type)
         if not isinstance(decl_type, ast.IntType):
-            self._fatal(Checker.L_TYPE_MISMATCH, f"{decl.lineno, decl.col_offset} ConstDecl must be of an integral type.")
+            self._fatal(Checker.L_TYPE_MISMATCH, f"{_pos(decl)} ConstDecl must be of an integral type.")
         
-        epchk = ExprPropertyChecker(self.scope)
-        props: ExprProperty = epchk.visit(decl.value)
+        props: ExprProperty = self._properties(decl.value)
         
         if not props.is_const():
-            self._fatal(Checker.L_TYPE_MISMATCH, f"{decl.value.lineno, decl.value.col_offset} ConstDecl initial expression must be constant.")
+            self._fatal(Checker.L_TYPE_MISMATCH, f"{_pos(decl.value)} ConstDecl initial expression must be constant.")
         
-        return self.__check_Decl(decl)
+        self.__check_Decl(decl)
+        return decl
     
     # Manage expressions
     def visit_CallExpr(self, cexpr: ast.CallExpr) -> ast.AST:
@@ -403,21 +566,21 @@ class Checker(ast.NodeVisitor):
         
         super().generic_visit(cexpr)
         
-        func_expr_type = GetExpressionType(self.scope, cexpr.func_expr)
-        start = cexpr.func_expr.lineno, cexpr.func_expr.col_offset
-        end = cexpr.func_expr.end_lineno, cexpr.func_expr.end_col_offset
+        func_expr_type = self._typeof(cexpr.func_expr)
         
         if not isinstance(func_expr_type, ast.FuncType):
+            start, end = _pos(cexpr.func_expr), _end_pos(cexpr.func_expr)
             self._fatal(self.L_TYPE_MISMATCH, f"expected expression to be FuncType at {start}-{end}")
         
         # Check that the right amount of parameters are being passed.
-        nparams = len(func_expr_type.param_types)
+        nparams = func_expr_type._nparams
         nargs = len(cexpr.args)
         if nargs < nparams or not (func_expr_type.is_variadic or nargs == nparams):
-            self._fatal(self.L_TYPE_MISMATCH, f"function call  at {cexpr.lineno, cexpr.col_offset}-{cexpr.end_lineno, cexpr.end_col_offset} expects {nparams} parameters {'or more ' if func_expr_type.is_variadic else ''}but got {nargs}.")
+            self._fatal(self.L_TYPE_MISMATCH, f"function call  at {_pos(cexpr)}-{_end_pos(cexpr)} expects {nparams} parameters {'or more ' if func_expr_type.is_variadic else ''}but got {nargs}.")
         
-        for i, param_type in enumerate(func_expr_type.param_types):
-            if not nsst.CompareTypesEquiv(self.scope, param_type, GetExpressionType(self.scope, cexpr.args[i])):
+        for i, (param_type, arg) in enumerate(zip(func_expr_type.param_types, cexpr.args)):
+            if not self._equiv(param_type, self._typeof(arg)):
+                start, end = _pos(cexpr.func_expr), _end_pos(cexpr.func_expr)
                 self._fatal(self.L_TYPE_MISMATCH, f"mismatched type for argument {i} of function call at {start}-{end}")
         
         return cexpr
@@ -428,21 +591,20 @@ class Checker(ast.NodeVisitor):
         
         super().generic_visit(iexpr)
         
-        array_expr_type = GetExpressionType(self.scope, iexpr.array_expr)
+        array_expr_type = self._typeof(iexpr.array_expr)
         if not isinstance(array_expr_type, ast.ArrayType):
-            start = iexpr.array_expr.lineno, iexpr.array_expr.col_offset
-            end = iexpr.array_expr.end_lineno, iexpr.array_expr.end_col_offset
+            start, end = _pos(iexpr.array_expr), _end_pos(iexpr.array_expr)
             self._fatal(self.L_TYPE_MISMATCH, f"expected expression to be ArrayType at {start}-{end}")
 
         if isinstance(array_expr_type.inner_type, ast.VoidType):
-            self._fatal(Checker.L_VOIDTYPE_DISALLOWED, f"{iexpr.lineno, iexpr.col_offset} cannot index an array of voids.")
+            self._fatal(Checker.L_VOIDTYPE_DISALLOWED, f"{_pos(iexpr)} cannot index an array of voids.")
 
-        index_expr_type = GetExpressionType(self.scope, iexpr.index_expr)
-        start = iexpr.index_expr.lineno, iexpr.index_expr.col_offset
-        end = iexpr.index_expr.end_lineno, iexpr.index_expr.end_col_offset
+        index_expr_type = self._typeof(iexpr.index_expr)
         if not isinstance(index_expr_type, ast.IntType):
+            start, end = _pos(iexpr.index_expr), _end_pos(iexpr.index_expr)
             self._fatal(self.L_TYPE_MISMATCH, f"expected expression to be IntType at {start}-{end}")
         if index_expr_type.type not in ("int", "long"):
+            start, end = _pos(iexpr.index_expr), _end_pos(iexpr.index_expr)
             self._fatal(self.L_INT_PRECISION, f"IntType index at {start}-{end} must be int or long")
         return iexpr
     
@@ -452,16 +614,13 @@ class Checker(ast.NodeVisitor):
         
         super().generic_visit(aexpr)
         
-        record_expr_type = GetExpressionType(self.scope, aexpr.record_expr)
-        if not isinstance(record_expr_type, (ast.StructType, ast.UnionType)):
-            start = aexpr.record_expr.lineno, aexpr.record_expr.col_offset
-            end = aexpr.record_expr.end_lineno, aexpr.record_expr.end_col_offset
+        record_expr_type = self._typeof(aexpr.record_expr)
+        if not isinstance(record_expr_type, _RECORD_TYPES):
+            start, end = _pos(aexpr.record_expr), _end_pos(aexpr.record_expr)
             self._fatal(self.L_TYPE_MISMATCH, f"expected expression to be StructType or UnionType at {start}-{end}")
 
-        for member in record_expr_type.members:
-            if member.name == aexpr.member_name: break
-        else:
-            self._fatal(self.L_MISSING_MEMBER, f"{aexpr.lineno, aexpr.col_offset} record expression does not have a member called '{aexpr.member_name}'.")
+        if _get_member(record_expr_type, aexpr.member_name) is None:
+            self._fatal(self.L_MISSING_MEMBER, f"{_pos(aexpr)} record expression does not have a member called '{aexpr.member_name}'.")
         
         return aexpr
     
@@ -471,16 +630,16 @@ class Checker(ast.NodeVisitor):
         
         super().generic_visit(cexpr)
         
-        inner_expr_type = GetExpressionType(self.scope, cexpr.expr)
-        cast_type = nsst.ExpandType(self.scope, cexpr.cast_type)
+        inner_expr_type = self._typeof(cexpr.expr)
+        cast_type = self._expand(cexpr.cast_type)
         
         if cexpr.signed and not isinstance(cast_type, ast.IntType):
-            self._fatal(self.L_TYPE_MISMATCH, f"{cexpr.cast_type.lineno, cexpr.cast_type.col_offset} cast type cannot be signed since it is not an integral type.")
+            self._fatal(self.L_TYPE_MISMATCH, f"{_pos(cexpr.cast_type)} cast type cannot be signed since it is not an integral type.")
         
         can_cast = CanCastTypes(self.scope, inner_expr_type, cast_type)
         
         if can_cast:
-            self._fatal(self.L_TYPE_MISMATCH, f"{cexpr.lineno, cexpr.col_offset} "+can_cast)        
+            self._fatal(self.L_TYPE_MISMATCH, f"{_pos(cexpr)} "+can_cast)        
         
         return cexpr
     
@@ -490,14 +649,13 @@ class Checker(ast.NodeVisitor):
         
         super().generic_visit(dexpr)
         
-        pointer_expr_type = GetExpressionType(self.scope, dexpr.pointer_expr)
+        pointer_expr_type = self._typeof(dexpr.pointer_expr)
         if not isinstance(pointer_expr_type, ast.ArrayType):
-            start = dexpr.pointer_expr.lineno, dexpr.pointer_expr.col_offset
-            end = dexpr.pointer_expr.end_lineno, dexpr.pointer_expr.end_col_offset
+            start, end = _pos(dexpr.pointer_expr), _end_pos(dexpr.pointer_expr)
             self._fatal(self.L_TYPE_MISMATCH, f"expected expression to be ArrayType at {start}-{end}")
         
         if isinstance(pointer_expr_type.inner_type, ast.VoidType):
-            self._fatal(Checker.L_VOIDTYPE_DISALLOWED, f"{dexpr.lineno, dexpr.col_offset} cannot dereference a void pointer.")
+            self._fatal(Checker.L_VOIDTYPE_DISALLOWED, f"{_pos(dexpr)} cannot dereference a void pointer.")
         
         return dexpr
     
@@ -507,11 +665,10 @@ class Checker(ast.NodeVisitor):
         
         super().generic_visit(aoexpr)
         
-        epchk = ExprPropertyChecker(self.scope)
-        props: ExprProperty = epchk.visit(aoexpr.expr)
+        props: ExprProperty = self._properties(aoexpr.expr)
         
         if not props.is_lvalue():
-            self._fatal(self.L_TYPE_MISMATCH, f"{aoexpr.lineno, aoexpr.col_offset} operand of AddrOfExpr must be an lvalue.")
+            self._fatal(self.L_TYPE_MISMATCH, f"{_pos(aoexpr)} operand of AddrOfExpr must be an lvalue.")
 
         return aoexpr
     
@@ -521,9 +678,9 @@ class Checker(ast.NodeVisitor):
         
         super().generic_visit(uexpr)
         
-        expr_type = GetExpressionType(self.scope, uexpr.expr)
+        expr_type = self._typeof(uexpr.expr)
         if not isinstance(expr_type, ast.IntType):
-            self._fatal(self.L_TYPE_MISMATCH, f"{uexpr.lineno, uexpr.col_offset} UnaryOp '{uexpr.op.__class__.__name__}' expects an integral operand, got {expr_type.__class__.__name__}.")
+            self._fatal(self.L_TYPE_MISMATCH, f"{_pos(uexpr)} UnaryOp '{uexpr.op.__class__.__name__}' expects an integral operand, got {expr_type.__class__.__name__}.")
 
         return uexpr
     
@@ -533,49 +690,27 @@ class Checker(ast.NodeVisitor):
         
         super().generic_visit(uexpr)
         
-        expr_type = GetExpressionType(self.scope, uexpr.expr)
-        if not isinstance(expr_type, (ast.IntType, ast.ArrayType, ast.FuncType)):
-            self._fatal(self.L_TYPE_MISMATCH, f"{uexpr.lineno, uexpr.col_offset} UnaryCOp '{uexpr.op.__class__.__name__}' expects an integral, array, pointer, or function operand, got {expr_type.__class__.__name__}.")
+        expr_type = self._typeof(uexpr.expr)
+        if not isinstance(expr_type, _COND_OK):
+            self._fatal(self.L_TYPE_MISMATCH, f"{_pos(uexpr)} UnaryCOp '{uexpr.op.__class__.__name__}' expects an integral, array, pointer, or function operand, got {expr_type.__class__.__name__}.")
 
         return uexpr
     
-    def visit_BinaryExpr(self, bexpr: ast.BinaryExpr) -> ast.AST:
-        "Check that the operands are integers, arrays, pointers, or function type with restrictions."
-        if self.typedef_check: return bexpr
-        
-        super().generic_visit(bexpr)
-        
-        left_expr_type = GetExpressionType(self.scope, bexpr.left)
-        right_expr_type = GetExpressionType(self.scope, bexpr.right)
-        
-        if not isinstance(left_expr_type, (ast.IntType, ast.ArrayType, ast.FuncType)):
-            self._fatal(self.L_TYPE_MISMATCH, f"{bexpr.left.lineno, bexpr.left.col_offset} BinaryExpr expects left operand to be an integer, array, pointer, or function, got {left_expr_type.__class__.__name__}.")
-        if not isinstance(right_expr_type, (ast.IntType, ast.ArrayType, ast.FuncType)):
-            self._fatal(self.L_TYPE_MISMATCH, f"{bexpr.right.lineno, bexpr.right.col_offset} BinaryExpr expects right operand to be an integer, array, pointer, or function, got {right_expr_type.__class__.__name__}.")
-        
-        can_cast = CanCastTypes(self.scope, right_expr_type, left_expr_type)
-        
-        if can_cast != None:
-            self._fatal(self.L_TYPE_MISMATCH, f"{bexpr.lineno, bexpr.col_offset} left and right operands are incompatible: "+can_cast)
-        
-        # Check operation validity with type
-        if isinstance(left_expr_type, (ast.ArrayType, ast.FuncType)) or isinstance(right_expr_type, (ast.ArrayType, ast.FuncType)):
-            if not isinstance(bexpr.op, (ast.Add, ast.Sub)):
-                self._fatal(self.L_TYPE_MISMATCH, f"{bexpr.lineno, bexpr.col_offset} array, pointers, and function expressions only support addition and subtraction for arithmetic.")
-        
+    def _insert_widening_cast(self, bexpr: ast.BinaryExpr | ast.BinaryCondExpr, left_expr_type: ast.Type, right_expr_type: ast.Type) -> None:
+        "Warns about size changes and wraps the right operand in a CastExpr to the left type when the operand types differ."
         # Check for type downgrade
         left_size = right_size = 2
         
-        if isinstance(left_expr_type, ast.IntType): left_size = nstypes.CFG.INT_SIZES[left_expr_type.type]
-        if isinstance(right_expr_type, ast.IntType): right_size = nstypes.CFG.INT_SIZES[right_expr_type.type]
+        if isinstance(left_expr_type, ast.IntType): left_size = _INT_SIZES[left_expr_type.type]
+        if isinstance(right_expr_type, ast.IntType): right_size = _INT_SIZES[right_expr_type.type]
         
         if left_size < right_size: # Downgrade
-            self.logger.warn(f"{bexpr.lineno, bexpr.col_offset} downgrading right side of expression.")
+            self.logger.warn(f"{_pos(bexpr)} downgrading right side of expression.")
         elif left_size > right_size: # Upgrade
-            self.logger.warn(f"{bexpr.lineno, bexpr.col_offset} upgrading right side of expression. default behaviour is unsigned extension.")
+            self.logger.warn(f"{_pos(bexpr)} upgrading right side of expression. default behaviour is unsigned extension.")
         
         # Add conversion if necessary
-        if not nsst.CompareTypesEquiv(self.scope, left_expr_type, right_expr_type):
+        if not self._equiv(left_expr_type, right_expr_type):
             start = (bexpr.right.lineno, bexpr.right.col_offset)
             end = (bexpr.right.end_lineno, bexpr.right.end_col_offset)
             bexpr.right = ast.CastExpr(
@@ -585,6 +720,34 @@ class Checker(ast.NodeVisitor):
             )
             bexpr.right.lineno, bexpr.right.col_offset = start
             bexpr.right.end_lineno, bexpr.right.end_col_offset = end
+            # The wrapped operand keeps its _type_cache entry (it lives on under
+            # the cast); the CastExpr itself is computed on demand.
+    
+    def visit_BinaryExpr(self, bexpr: ast.BinaryExpr) -> ast.AST:
+        "Check that the operands are integers, arrays, pointers, or function type with restrictions."
+        if self.typedef_check: return bexpr
+        
+        super().generic_visit(bexpr)
+        
+        left_expr_type = self._typeof(bexpr.left)
+        right_expr_type = self._typeof(bexpr.right)
+        
+        if type(left_expr_type) not in _COND_OK_SET:
+            self._fatal(self.L_TYPE_MISMATCH, f"{_pos(bexpr.left)} BinaryExpr expects left operand to be an integer, array, pointer, or function, got {left_expr_type.__class__.__name__}.")
+        if type(right_expr_type) not in _COND_OK_SET:
+            self._fatal(self.L_TYPE_MISMATCH, f"{_pos(bexpr.right)} BinaryExpr expects right operand to be an integer, array, pointer, or function, got {right_expr_type.__class__.__name__}.")
+        
+        can_cast = CanCastTypes(self.scope, right_expr_type, left_expr_type)
+        
+        if can_cast != None:
+            self._fatal(self.L_TYPE_MISMATCH, f"{_pos(bexpr)} left and right operands are incompatible: "+can_cast)
+        
+        # Check operation validity with type
+        if isinstance(left_expr_type, _ARR_FUNC) or isinstance(right_expr_type, _ARR_FUNC):
+            if not isinstance(bexpr.op, (ast.Add, ast.Sub)):
+                self._fatal(self.L_TYPE_MISMATCH, f"{_pos(bexpr)} array, pointers, and function expressions only support addition and subtraction for arithmetic.")
+        
+        self._insert_widening_cast(bexpr, left_expr_type, right_expr_type)
         
         return bexpr
     
@@ -594,47 +757,29 @@ class Checker(ast.NodeVisitor):
         
         super().generic_visit(bexpr)
         
-        left_expr_type = GetExpressionType(self.scope, bexpr.left)
-        right_expr_type = GetExpressionType(self.scope, bexpr.right)
+        left_expr_type = self._typeof(bexpr.left)
+        right_expr_type = self._typeof(bexpr.right)
         
-        if not isinstance(left_expr_type, (ast.IntType, ast.ArrayType, ast.FuncType)):
-            self._fatal(self.L_TYPE_MISMATCH, f"{bexpr.left.lineno, bexpr.left.col_offset} BinaryCondExpr expects left operand to be an integer, array, pointer, or function, got {left_expr_type.__class__.__name__}.")
-        if not isinstance(right_expr_type, (ast.IntType, ast.ArrayType, ast.FuncType)):
-            self._fatal(self.L_TYPE_MISMATCH, f"{bexpr.right.lineno, bexpr.right.col_offset} BinaryCondExpr expects right operand to be an integer, array, pointer, or function, got {right_expr_type.__class__.__name__}.")
+        if type(left_expr_type) not in _COND_OK_SET:
+            self._fatal(self.L_TYPE_MISMATCH, f"{_pos(bexpr.left)} BinaryCondExpr expects left operand to be an integer, array, pointer, or function, got {left_expr_type.__class__.__name__}.")
+        if type(right_expr_type) not in _COND_OK_SET:
+            self._fatal(self.L_TYPE_MISMATCH, f"{_pos(bexpr.right)} BinaryCondExpr expects right operand to be an integer, array, pointer, or function, got {right_expr_type.__class__.__name__}.")
         
         can_cast = CanCastTypes(self.scope, right_expr_type, left_expr_type)
         
         if can_cast != None:
-            self._fatal(self.L_TYPE_MISMATCH, f"{bexpr.lineno, bexpr.col_offset} left and right operands are incompatible: "+can_cast)
+            self._fatal(self.L_TYPE_MISMATCH, f"{_pos(bexpr)} left and right operands are incompatible: "+can_cast)
         
         # Check operation validity with type
-        if isinstance(left_expr_type, (ast.ArrayType, ast.FuncType)) or isinstance(right_expr_type, (ast.ArrayType, ast.FuncType)):
+        if isinstance(left_expr_type, _ARR_FUNC) or isinstance(right_expr_type, _ARR_FUNC):
             if not isinstance(bexpr.op, (ast.LogicalAnd, ast.LogicalOr, ast.Eq, ast.NotEq)):
-                self._fatal(self.L_TYPE_MISMATCH, f"{bexpr.lineno, bexpr.col_offset} array, pointers, and function expressions only support equal, not equal, logical and and logical not for conditional operators.")
+                self._fatal(self.L_TYPE_MISMATCH, f"{_pos(bexpr)} array, pointers, and function expressions only support equal, not equal, logical and and logical not for conditional operators.")
         
-        # Check for type downgrade
-        if not isinstance(left_expr_type, (ast.LogicalAnd, ast.LogicalOr)):
-            left_size = right_size = 2
-            
-            if isinstance(left_expr_type, ast.IntType): left_size = nstypes.CFG.INT_SIZES[left_expr_type.type]
-            if isinstance(right_expr_type, ast.IntType): right_size = nstypes.CFG.INT_SIZES[right_expr_type.type]
-            
-            if left_size < right_size: # Downgrade
-                self.logger.warn(f"{bexpr.lineno, bexpr.col_offset} downgrading right side of expression.")
-            elif left_size > right_size: # Upgrade
-                self.logger.warn(f"{bexpr.lineno, bexpr.col_offset} upgrading right side of expression. default behaviour is unsigned extension.")
-            
-            # Add conversion if necessary
-            if not nsst.CompareTypesEquiv(self.scope, left_expr_type, right_expr_type):
-                start = (bexpr.right.lineno, bexpr.right.col_offset)
-                end = (bexpr.right.end_lineno, bexpr.right.end_col_offset)
-                bexpr.right = ast.CastExpr(
-                    expr = bexpr.right,
-                    cast_type = left_expr_type,
-                    signed = False
-                )
-                bexpr.right.lineno, bexpr.right.col_offset = start
-                bexpr.right.end_lineno, bexpr.right.end_col_offset = end
+        # Logical and/or compare truthiness, not values, so no widening cast
+        # is needed there. (This previously tested left_expr_type against the
+        # operator classes, which never matched.)
+        if not isinstance(bexpr.op, (ast.LogicalAnd, ast.LogicalOr)):
+            self._insert_widening_cast(bexpr, left_expr_type, right_expr_type)
         
         return bexpr
     
@@ -644,15 +789,15 @@ class Checker(ast.NodeVisitor):
         
         super().generic_visit(texpr)
         
-        cond_expr_type = GetExpressionType(self.scope, texpr.cond_expr)
-        true_expr_type = GetExpressionType(self.scope, texpr.true_expr)
-        false_expr_type = GetExpressionType(self.scope, texpr.false_expr)
+        cond_expr_type = self._typeof(texpr.cond_expr)
+        true_expr_type = self._typeof(texpr.true_expr)
+        false_expr_type = self._typeof(texpr.false_expr)
         
-        if not isinstance(cond_expr_type, (ast.IntType, ast.ArrayType, ast.FuncType)):
-            self._fatal(self.L_TYPE_MISMATCH, f"{texpr.lineno, texpr.col_offset} TernaryExpr expects an integer, array, pointer, or function as conditional expression, got {cond_expr_type.__class__.__name__}")
+        if type(cond_expr_type) not in _COND_OK_SET:
+            self._fatal(self.L_TYPE_MISMATCH, f"{_pos(texpr)} TernaryExpr expects an integer, array, pointer, or function as conditional expression, got {cond_expr_type.__class__.__name__}")
         
-        if not nsst.CompareTypesEquiv(self.scope, true_expr_type, false_expr_type):
-            self._fatal(self.L_TYPE_MISMATCH, f"{texpr.lineno, texpr.col_offset} true value and false value of TernaryExpr do not have the same type.")
+        if not self._equiv(true_expr_type, false_expr_type):
+            self._fatal(self.L_TYPE_MISMATCH, f"{_pos(texpr)} true value and false value of TernaryExpr do not have the same type.")
 
         return texpr
      
@@ -664,27 +809,26 @@ class Checker(ast.NodeVisitor):
         
         super().generic_visit(aexpr)
         
-        lhs_expr_type = GetExpressionType(self.scope, aexpr.lhs)
-        rhs_expr_type = GetExpressionType(self.scope, aexpr.rhs)
+        lhs_expr_type = self._typeof(aexpr.lhs)
+        rhs_expr_type = self._typeof(aexpr.rhs)
         
-        if not nsst.CompareTypesEquiv(self.scope, lhs_expr_type, rhs_expr_type):
-            self._fatal(self.L_TYPE_MISMATCH, f"{aexpr.lineno, aexpr.col_offset} left-hand side and right-hand side of AssignExpr do not have the same type.")
+        if not self._equiv(lhs_expr_type, rhs_expr_type):
+            self._fatal(self.L_TYPE_MISMATCH, f"{_pos(aexpr)} left-hand side and right-hand side of AssignExpr do not have the same type.")
         
         # Check lhs is lvalue
-        epchk = ExprPropertyChecker(self.scope)
-        props: ExprProperty = epchk.visit(aexpr.lhs)
+        props: ExprProperty = self._properties(aexpr.lhs)
         if not props.is_lvalue():
-            self._fatal(Checker.L_TYPE_MISMATCH, f"{aexpr.lineno, aexpr.col_offset} AssignExpr left-hand side must be an lvalue.")
+            self._fatal(Checker.L_TYPE_MISMATCH, f"{_pos(aexpr)} AssignExpr left-hand side must be an lvalue.")
                 
         # Check operator if necessary
         if aexpr.op != None:
-            if not isinstance(lhs_expr_type, (ast.IntType, ast.ArrayType, ast.FuncType)):
-                self._fatal(self.L_TYPE_MISMATCH, f"{aexpr.lineno, aexpr.col_offset} an AssignExpr can only be augmented with an operator if its operands are integers, arrays, pointers, or function, got {lhs_expr_type.__class__.__name__}")
+            if type(lhs_expr_type) not in _COND_OK_SET:
+                self._fatal(self.L_TYPE_MISMATCH, f"{_pos(aexpr)} an AssignExpr can only be augmented with an operator if its operands are integers, arrays, pointers, or function, got {lhs_expr_type.__class__.__name__}")
             
             # Check operation validity with type
-            if isinstance(lhs_expr_type, (ast.ArrayType, ast.FuncType)):
+            if isinstance(lhs_expr_type, _ARR_FUNC):
                 if not isinstance(aexpr.op, (ast.Add, ast.Sub)):
-                    self._fatal(self.L_TYPE_MISMATCH, f"{aexpr.lineno, aexpr.col_offset} array, pointers, and function expressions only support addition and subtraction for arithmetic in an augmented AssignExpr.")
+                    self._fatal(self.L_TYPE_MISMATCH, f"{_pos(aexpr)} array, pointers, and function expressions only support addition and subtraction for arithmetic in an augmented AssignExpr.")
         
         return aexpr
     
@@ -698,30 +842,35 @@ class Checker(ast.NodeVisitor):
         # so we only check that arrays have the same type across all of its members.
         if cexpr.type != "array": return cexpr
         
-        inner_type = GetExpressionType(self.scope, cexpr.value[0])
-        for i, expr in enumerate(cexpr.value):
-            if not nsst.CompareTypesEquiv(self.scope, inner_type, GetExpressionType(self.scope, expr)):
-                self._fatal(Checker.L_TYPE_MISMATCH, f"{expr.lineno, expr.col_offset} element {i} of array expression at {cexpr.lineno, cexpr.col_offset} has mismatched type.")
+        inner_type = self._typeof(cexpr.value[0])
+        for i, expr in enumerate(cexpr.value[1:], 1):
+            expr_type = self._typeof(expr)
+            if expr_type is inner_type: continue # shared type nodes are trivially equivalent
+            if not self._equiv(inner_type, expr_type):
+                self._fatal(Checker.L_TYPE_MISMATCH, f"{_pos(expr)} element {i} of array expression at {_pos(cexpr)} has mismatched type.")
         
         return cexpr
               
     # Manage circular types
     def visit_VoidType(self, vtype: ast.VoidType) -> ast.AST:
         "If we found an unexpected void type then this is problematic so give an error."
-        self._fatal(Checker.L_VOIDTYPE_DISALLOWED, f"{vtype.lineno, vtype.col_offset} unexpected void type.")
+        self._fatal(Checker.L_VOIDTYPE_DISALLOWED, f"{_pos(vtype)} unexpected void type.")
     
     def visit_TypeDecl(self, tdecl: ast.TypeDecl) -> ast.AST:
         "Check that type declarations are not circular."
         if not self.typedef_check: return tdecl
         
-        self.logger.debug(f"{tdecl.lineno, tdecl.col_offset} entering TypeDecl {tdecl.name}.")
+        self.logger.debug(f"{_pos(tdecl)} entering TypeDecl {tdecl.name}.")
         self.logger.increasepad()
         
         self.typenames.append(tdecl.name)
+        self._typenames_set.add(tdecl.name)
         self.visit(tdecl.type)
         self.typenames.pop()
+        self._typenames_set.discard(tdecl.name)
+        self._acyclic_typesyms.add(self.scope.get_typesym(tdecl.name))
         
-        self.logger.debug(f"exiting TypeDecl {tdecl.name} at {tdecl.lineno, tdecl.col_offset}-{tdecl.end_lineno, tdecl.end_col_offset}.")
+        self.logger.debug(f"exiting TypeDecl {tdecl.name} at {_pos(tdecl)}-{_end_pos(tdecl)}.")
         self.logger.decreasepad()
         return tdecl
     
@@ -739,57 +888,59 @@ class Checker(ast.NodeVisitor):
         
         ttype._reference()
         
-        if len(self.typenames) > 0:
-            if rtype.ref_type_name in self.typenames:
+        if len(self.typenames) > 0 and ttype not in self._acyclic_typesyms:
+            if rtype.ref_type_name in self._typenames_set:
                 self._fatal(self.L_CIRCTYPEDEF, f"{self.refpos} RefType {rtype.ref_type_name} has circular declaration {'>'.join(self.typenames)}>{rtype.ref_type_name}.")
             
             self.typenames.append(rtype.ref_type_name)
+            self._typenames_set.add(rtype.ref_type_name)
             prev_scope = self.scope
             self.scope = ttype.get_table()
             
             self.visit(ttype.get_type())
             self.scope = prev_scope
             self.typenames.pop()
+            self._typenames_set.discard(rtype.ref_type_name)
+            self._acyclic_typesyms.add(ttype)
         
         self.refpos = oldpos
         return rtype
     
     def visit_ArrayType(self, atype: ast.ArrayType) -> ast.AST:
         "Allow for VoidType in an ArrayType"
-        typenames = self.typenames
-        self.typenames = []
+        typenames, typenames_set = self.typenames, self._typenames_set
+        self.typenames, self._typenames_set = [], set()
         if atype.size != None or not isinstance(atype.inner_type, ast.VoidType):
             self.visit(atype.inner_type)
         if atype.size != None:
             self.visit(atype.size)
-            epchk = ExprPropertyChecker(self.scope)
-            props: ExprProperty = epchk.visit(atype.size)
+            props: ExprProperty = self._properties(atype.size)
             if not props.is_const():
-                self._fatal(Checker.L_TYPE_MISMATCH, f"{atype.lineno, atype.col_offset} ArrayType size must be constant.")
-        self.typenames = typenames
+                self._fatal(Checker.L_TYPE_MISMATCH, f"{_pos(atype)} ArrayType size must be constant.")
+        self.typenames, self._typenames_set = typenames, typenames_set
         return atype
     
     def visit_FuncType(self, ftype: ast.FuncType) -> ast.AST:
         "Allow for VoidType as the return type of a FuncType"
-        typenames = self.typenames
-        self.typenames = []
+        typenames, typenames_set = self.typenames, self._typenames_set
+        self.typenames, self._typenames_set = [], set()
         if not isinstance(ftype.return_type, ast.VoidType):
             self.visit(ftype.return_type)
         for param_type in ftype.param_types:
             self.visit(param_type)
-        self.typenames = typenames
+        self.typenames, self._typenames_set = typenames, typenames_set
         return ftype
     
     def visit_MemberData(self, mdata: ast.MemberData) -> ast.AST:
         if not self.typedef_check: return mdata
         super().generic_visit(mdata)
         if mdata.bits != None:
-            type = nsst.ExpandType(self.scope, mdata.type)
+            type = self._expand(mdata.type)
             if not isinstance(type, ast.IntType):
-                self._fatal(Checker.L_INVALIDBITS, f"{(mdata.lineno, mdata.col_offset)} Member {mdata.name} has bits value {mdata.bits} but is not an integral type.")
-            bit_size = nstypes.CFG.INT_SIZES[type.type] * nstypes.CFG.BITS_PER_WORD
+                self._fatal(Checker.L_INVALIDBITS, f"{_pos(mdata)} Member {mdata.name} has bits value {mdata.bits} but is not an integral type.")
+            bit_size = _INT_SIZES[type.type] * nstypes.CFG.BITS_PER_WORD
             if mdata.bits > bit_size:
-                self._fatal(Checker.L_INVALIDBITS, f"{(mdata.lineno, mdata.col_offset)} Member {mdata.name} is a {bit_size}-bit IntType, but has bits value of {mdata.bits}.")
+                self._fatal(Checker.L_INVALIDBITS, f"{_pos(mdata)} Member {mdata.name} is a {bit_size}-bit IntType, but has bits value of {mdata.bits}.")
         return mdata
     
     # Manage scoping
@@ -803,7 +954,7 @@ class Checker(ast.NodeVisitor):
         self.logger.debug(f"entering scope of FuncDecl {fdecl.name}.")
         self.logger.increasepad()
         
-        self.ret_type = nsst.ExpandType(self.scope, fdecl.type.return_type)
+        self.ret_type = self._expand(fdecl.type.return_type)
         self.scope = fdecl.symref.get_created_functable()
         super().generic_visit(fdecl)
         self.scope = self.scope.get_parent()
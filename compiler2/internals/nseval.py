@@ -10,61 +10,89 @@ import internals.nstypes as nstypes
 Module that evaluates and simplifies expression trees passed to it.
 """
 
+# Computed sizes keyed by the (scope, node, eval_array) triple; sizes are
+# queried repeatedly for the same declarations during code generation.
+_size_cache: dict[tuple[nssym.SymbolTable, ast.Type, bool], int] = {}
+
 def get_type_size(scope: nssym.SymbolTable, type: ast.Type, eval_array: bool = False):
-    if isinstance(type, ast.RefType):
-        return get_type_size(scope, nsst.ExpandType(scope, type), eval_array=eval_array)
-    
-    elif isinstance(type, ast.IntType):
-        return nstypes.CFG.INT_SIZES[type.type]
-    
-    elif isinstance(type, ast.ArrayType):
-        if not eval_array or type.size == None:
-            return nstypes.CFG.PTR_SIZE
-        
-        simplifier = ExprSimplifier(scope)
-        expr = simplifier.visit(type.size)
-        if not isinstance(expr, ast.IntExpr):
-            raise Exception(f"nschk failed, ArrayType at {type.lineno, type.col_offset} size expected an IntExpr but got {expr.__class__.__name__}")
-        return expr.value * get_type_size(scope, type.inner_type, eval_array=True)
-        
-    elif isinstance(type, ast.FuncType):
+    key = (scope, type, eval_array)
+    size = _size_cache.get(key)
+    if size is None:
+        size = _size_cache[key] = _compute_type_size(scope, type, eval_array)
+    return size
+
+# Per-class size handlers, dispatched on the exact type class.
+def _size_ref(scope, type, eval_array):
+    return get_type_size(scope, nsst.ExpandType(scope, type), eval_array=eval_array)
+
+def _size_int(scope, type, eval_array):
+    return nstypes.CFG.INT_SIZES[type.type]
+
+def _size_array(scope, type, eval_array):
+    if not eval_array or type.size == None:
         return nstypes.CFG.PTR_SIZE
     
-    elif isinstance(type, ast.StructType):
-        # A struct type is the accumulation of all its other types when accounting for integer bits
-        full_size = 0 # Full size of the struct
-        int_max = 0 # Maximum size in current integer
-        int_bits = 0 # Building of bits
-        for member in type.members:
-            if isinstance(member.type, ast.IntType) and member.bits not in [None, -1]:
-                # Get current integer size
-                cur_int_max = nstypes.CFG.BITS_PER_WORD * nstypes.CFG.INT_SIZES[member.type.type]
-                
-                # If the previous member wasn't the same integer size, we reset it.
-                if int_max != cur_int_max:
-                    full_size += int_max // nstypes.CFG.BITS_PER_WORD
-                    int_max = cur_int_max
-                    int_bits = 0
-                
-                # Now we add the wanted bits to int_bits if there is enough space
-                if int_bits + member.bits > int_max:
-                    full_size += int_max // nstypes.CFG.BITS_PER_WORD
-                    int_bits = 0
-                int_bits += member.bits
-            else:
-                int_max = 0
+    simplifier = ExprSimplifier(scope)
+    expr = simplifier.visit(type.size)
+    if not isinstance(expr, ast.IntExpr):
+        raise Exception(f"nschk failed, ArrayType at {type.lineno, type.col_offset} size expected an IntExpr but got {expr.__class__.__name__}")
+    return expr.value * get_type_size(scope, type.inner_type, eval_array=True)
+
+def _size_func(scope, type, eval_array):
+    return nstypes.CFG.PTR_SIZE
+
+def _size_struct(scope, type, eval_array):
+    # A struct type is the accumulation of all its other types when accounting for integer bits
+    full_size = 0 # Full size of the struct
+    int_max = 0 # Maximum size in current integer
+    int_bits = 0 # Building of bits
+    # The CFG values are invariant across the loop; resolve them once.
+    bits_per_word = nstypes.CFG.BITS_PER_WORD
+    int_sizes = nstypes.CFG.INT_SIZES
+    for member in type.members:
+        member_type = member.type
+        member_bits = member.bits
+        if isinstance(member_type, ast.IntType) and member_bits is not None and member_bits != -1:
+            # Get current integer size
+            cur_int_max = bits_per_word * int_sizes[member_type.type]
+            
+            # If the previous member wasn't the same integer size, we reset it.
+            if int_max != cur_int_max:
+                full_size += int_max // bits_per_word
+                int_max = cur_int_max
                 int_bits = 0
-                full_size += get_type_size(scope, member.type, eval_array=eval_array)
-        # Clear any left over integers
-        if int_bits != 0:
-            full_size += int_max // nstypes.CFG.BITS_PER_WORD
             
-        return full_size
-    
-    elif isinstance(type, ast.UnionType):
-        # A union type is as big as its largest member.
-        return max(map(lambda x: get_type_size(x.type, eval_array=eval_array), type.members))
-    
+            # Now we add the wanted bits to int_bits if there is enough space
+            if int_bits + member_bits > int_max:
+                full_size += int_max // bits_per_word
+                int_bits = 0
+            int_bits += member_bits
+        else:
+            int_max = 0
+            int_bits = 0
+            full_size += get_type_size(scope, member_type, eval_array=eval_array)
+    # Clear any left over integers
+    if int_bits != 0:
+        full_size += int_max // bits_per_word
+        
+    return full_size
+
+def _size_union(scope, type, eval_array):
+    # A union type is as big as its largest member.
+    return max((get_type_size(scope, m.type, eval_array=eval_array) for m in type.members), default=0)
+
+_SIZE_DISPATCH: dict[type, any] = {
+    ast.RefType: _size_ref,
+    ast.IntType: _size_int,
+    ast.ArrayType: _size_array,
+    ast.FuncType: _size_func,
+    ast.StructType: _size_struct,
+    ast.UnionType: _size_union,
+}
+
+def _compute_type_size(scope: nssym.SymbolTable, type: ast.Type, eval_array: bool):
+    handler = _SIZE_DISPATCH.get(type.__class__)
+    if handler is not None: return handler(scope, type, eval_array)
     raise Exception(f"Expected a Type here, got {type.__class__.__name__}")
 
 class ExprSimplifier(ast.NodeTransformer):
@@ -1,18 +1,21 @@
-from enum import Enum
+from enum import IntEnum, auto
+from bisect import bisect_right
 import re
+import sys
 import internals.nslog as nslog
 import internals.nstypes as nstypes
 
-class TokenType(Enum):
-    KEYWORD = "Keyword" # For keywords, value is keyword_name
-    NAME = "Name" # For declared values, value is name
-    INTEGER = "Int" # For integer literals, value is (value, type)
-    STRING = "String" # For string literals, value is utf8 array
-    PUNC = "Punctuator" # For punctuation, delimiters, and operators, value is punctuator
-    COMMENT = "Comment" # For comments, value is comment without comment delimiters
-    EOF = "EOF" # For the end of file
+class TokenType(IntEnum):
+    KEYWORD = auto() # For keywords, value is keyword_name
+    NAME = auto() # For declared values, value is name
+    INTEGER = auto() # For integer literals, value is (value, type)
+    STRING = auto() # For string literals, value is utf8 array
+    PUNC = auto() # For punctuation, delimiters, and operators, value is punctuator
+    COMMENT = auto() # For comments, value is comment without comment delimiters
+    EOF = auto() # For the end of file
 
-Keywords = (
+# Entries are interned so keyword token values share one object per keyword.
+Keywords = frozenset(map(sys.intern, (
     "set", "let", # Value definitions
     "func", # Function definitions
     "struct", "union", # Record definitions
@@ -23,7 +26,7 @@ Keywords = (
     "volatile", # Type modifier
     "if", "else", "for", "while", # Conditional control flow
     "break", "breakif", "continue", "return", # Jump statements
-)
+)))
 
 Punctuators = (
     "(", ")", "{", "}", "[", "]", # Parentheses, braces, brackets
@@ -41,7 +44,48 @@ Punctuators = (
     ":=", "+=", "-=", "*=", "/=", "/%=", "%$=", "%$=", "<<=", ">>=", ">>$=", "&=", "|=", "^=", # Assignments
 )
 
+# Punctuators grouped by first character, longest first, so recognition only
+# tests the few candidates sharing the current character's prefix.
+_PUNC_BY_PREFIX: dict[str, tuple[str, ...]] = {}
+for _punct in Punctuators:
+    _PUNC_BY_PREFIX.setdefault(_punct[0], []).append(_punct)
+for _prefix in _PUNC_BY_PREFIX:
+    _PUNC_BY_PREFIX[_prefix] = tuple(sorted(set(_PUNC_BY_PREFIX[_prefix]), key=len, reverse=True))
+del _punct, _prefix
+
+# One C-level match replaces the per-character whitespace walk.
+_WS_RE = re.compile(r"\s+")
+
+# Run scanners for identifiers and digit runs: the character-classification
+# loops move into re's C matching loop, leaving one slice per token.
+_NAME_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_DIGITS_RE = {
+    2: re.compile(r"[01][01_]*"),
+    8: re.compile(r"[0-7][0-7_]*"),
+    10: re.compile(r"[0-9][0-9_]*"),
+    16: re.compile(r"[0-9A-Fa-f][0-9A-Fa-f_]*"),
+}
+
+# Escape-sequence patterns, compiled once and matched against the source at
+# the current offset instead of re-slicing a lookahead window per escape.
+_OCT_ESC = re.compile(r"[0-7]{1,3}")
+_HEX_ESC = re.compile(r"x([0-9a-fA-F]{1,8})")
+_U4_ESC = re.compile(r"u([0-9a-fA-F]{4})")
+_U8_ESC = re.compile(r"U([0-9a-fA-F]{8})")
+_HEX_WARN = re.compile(r"[0-9A-Za-f]")
+
+# A run of string-literal characters needing no special handling.
+_STR_PLAIN = re.compile(r'[^"\\]+')
+
+# Numeric-literal suffix table and per-type modulus bounds, resolved once
+# instead of a CFG dict lookup and shift per literal.
+_SUFFIX_TYPES = {"i": "int", "l": "long"}
+_INT_TYPE_MAX = {name: 1 << (size * nstypes.CFG.BITS_PER_WORD)
+                 for name, size in nstypes.CFG.INT_SIZES.items()}
+
 class Token:
+    __slots__ = ("type", "value", "start_pos", "end_pos")
+    
     def __init__(self, type: TokenType, value: any, start_pos: tuple[int, int], end_pos: tuple[int, int]):
         """
         type:
@@ -62,9 +106,9 @@ class Token:
         self.end_pos = end_pos
     
     def istype(self, type: TokenType, value: any = None) -> bool:
-        if self.type != type: return False
+        if self.type is not type: return False
         if value:
-            if isinstance(value, tuple): return self.value in value
+            if isinstance(value, (tuple, frozenset)): return self.value in value
             return self.value == value
         return True
     
@@ -103,14 +147,25 @@ class Lexer:
     def __init__(self, source):
         self.source = source
         self.srcpos = 0
-        self.curln = 1
-        self.curcol = 0
         self.success = True
         self.logger = nslog.LoggerFactory.getLogger()
+        
+        # Offsets of every newline, prefixed by -1. (line, col) for any offset
+        # is then one bisect away, and advancing is a plain offset bump.
+        self._nl_offsets = nl_offsets = [-1]
+        nl = source.find("\n")
+        while nl != -1:
+            nl_offsets.append(nl)
+            nl = source.find("\n", nl + 1)
+    
+    def _pos_at(self, offset: int) -> tuple[int, int]:
+        "Returns the (line, column) position of the given source offset."
+        line = bisect_right(self._nl_offsets, offset - 1)
+        return (line, offset - self._nl_offsets[line - 1] - 1)
     
     def _snapshot(self) -> tuple[int, int]:
-        "Returns a snapshot of the current position, (curln, curcol)"
-        return (self.curln, self.curcol)
+        "Returns a snapshot of the current position, (line, column)"
+        return self._pos_at(self.srcpos)
 
     def _error(self, code: int, error: str):
         "Throw an error and mark lex as unsuccessful but continue lexing."
@@ -138,38 +193,50 @@ class Lexer:
         
         Returns False if EOF was met, True otherwise.
         """
-        while num > 0 and self.srcpos < len(self.source):
-            num -= 1
-            self.curcol += 1
-            if self._peek() == "\n":
-                self.curln += 1
-                self.curcol = 0
-            self.srcpos += 1
-        return num == 0
+        pos = self.srcpos + num
+        srclen = len(self.source)
+        if pos > srclen:
+            self.srcpos = srclen
+            return False
+        self.srcpos = pos
+        return True
     
     def _skipws(self):
         """
         Advances through all the consecutive whitespace characters it can find.
         """
-        while (peek := self._peek()) != None and peek.isspace():
+        m = _WS_RE.match(self.source, self.srcpos)
+        if m is not None:
+            self.srcpos = m.end()
+        elif self._peek().isspace():
+            # str.isspace and \s can disagree on exotic characters; fall back
+            # to the one-character step so the caller always makes progress.
             self._advance()
             
-    def lex_all(self) -> list[Token]:
+    def iter_tokens(self):
         """
-        Lex all tokens in source.
+        Lazily yields tokens from source, ending with the EOF token.
         """
-        tokens = []
+        logger = self.logger
+        debugging = logger.isEnabledFor(nslog.LogLevel.DEBUG)
         while True:
             token = self.next_token()
-            tokens.append(token)
-            value_str = str(token.value).replace("\n", "\\n")
-            start_pos_str = f"({token.start_pos[0]:>3}, {token.start_pos[1]:>3})"
-            end_pos_str = f"({token.end_pos[0]:>3}, {token.end_pos[1]:>3})"
-            if len(value_str) > 30:
-                value_str = value_str[:30] + "..."
-            self.logger.debug(f"lexed token {start_pos_str} - {end_pos_str}:   type= {token.type.name:>7},   value= '{value_str}'")
-            if token.type == TokenType.EOF:
-                return tokens
+            if debugging:
+                value_str = str(token.value).replace("\n", "\\n")
+                start_pos_str = f"({token.start_pos[0]:>3}, {token.start_pos[1]:>3})"
+                end_pos_str = f"({token.end_pos[0]:>3}, {token.end_pos[1]:>3})"
+                if len(value_str) > 30:
+                    value_str = value_str[:30] + "..."
+                logger.debug(f"lexed token {start_pos_str} - {end_pos_str}:   type= {token.type.name:>7},   value= '{value_str}'")
+            yield token
+            if token.type is TokenType.EOF:
+                return
+    
+    def lex_all(self) -> list[Token]:
+        """
+        Lex all tokens in source.
+        """
+        return list(self.iter_tokens())
     
     def next_token(self) -> Token:
         """
@@ -177,31 +244,37 @@ class Lexer:
         
         Returns EOF token if EOF was met.
         """
-        while self._peek() != "":
+        source = self.source
+        srclen = len(source)
+        while self.srcpos < srclen:
+            # Dispatch on the current character directly; indexing a str is
+            # much cheaper than the _peek slice-per-call pattern.
+            char = source[self.srcpos]
+            
             # Ignore whitespace
-            if self._peek().isspace():
+            if char.isspace():
                 self._skipws()
                 continue
             
             # Tokenize comments
-            if self._peek(2) == "/*":
-                self._advance(2)
-                value = ""
-                start_pos = self._snapshot()
-                while self._peek(2) != "*/":
-                    end_pos = self._snapshot()
-                    value += self._peek()
-                    if not self._advance():
-                        self._fatal(Lexer.L_EOF, f"{end_pos}: unexpected EOF in comment at {start_pos}")
-                self._advance(2)
-                return Token(TokenType.COMMENT, value, start_pos, end_pos)
+            if char == "/" and source.startswith("/*", self.srcpos):
+                # Jump straight to the terminator; the body is one slice.
+                start = self.srcpos + 2
+                end = source.find("*/", start)
+                if end < 0:
+                    self.srcpos = srclen
+                    self._fatal(Lexer.L_EOF, f"{self._pos_at(srclen)}: unexpected EOF in comment at {self._pos_at(start)}")
+                self.srcpos = end + 2
+                start_pos = self._pos_at(start)
+                end_pos = self._pos_at(end - 1) if end > start else start_pos
+                return Token(TokenType.COMMENT, source[start:end], start_pos, end_pos)
             
             # Parse an integer
-            if self._peek().isdigit():
+            if char.isdigit():
                 return self._readInt()
             
             # Parse a character
-            if self._peek() == "'":
+            if char == "'":
                 start_pos = self._snapshot()
                 
                 # Discard the opening quote
@@ -232,7 +305,7 @@ class Lexer:
                 return Token(TokenType.INTEGER, (char_int, int_type), start_pos, end_pos)
             
             # Parse a string as utf-8, 1 byte per word
-            if self._peek() == '"':
+            if char == '"':
                 return self._readString()
             
             # Parse a punctuator
@@ -243,7 +316,7 @@ class Lexer:
             if (name := self._tryReadKeywordOrName()):
                 return name
             
-            self._fatal(Lexer.L_UNKNOWN, f"{self._snapshot()}: unexpected character '{self._peek()}'.")
+            self._fatal(Lexer.L_UNKNOWN, f"{self._snapshot()}: unexpected character '{char}'.")
         
         return Token(TokenType.EOF, None, self._snapshot(), self._snapshot())
                 
@@ -265,19 +338,19 @@ class Lexer:
                 else: self._fatal(Lexer.L_INVALIDINTPREFIX, f"{start_pos}: invalid integer literal base prefix '0{peek}'")
                 self._advance()
         
-        chars = "0123456789ABCDEF"[0:base]
-        num_string = ""
-        while (peek := self._peek()) and (peek.upper() in chars):
-            num_string += peek
-            end_pos = self._snapshot()
-            self._advance()
-            while self._peek() == "_":
-                end_pos = self._snapshot()
-                self._advance()
+        source = self.source
+        start = self.srcpos
+        # A digit of the base, then any run of digits and separators.
+        m = _DIGITS_RE[base].match(source, start)
+        i = m.end() if m else start
         
-        if num_string == "":
+        if i == start:
             self._fatal(Lexer.L_EOF, f"{self._snapshot()}: expected number, got EOF.")
         
+        end_pos = self._pos_at(i - 1)
+        self._advance(i - start)
+        num_string = source[start:i].replace("_", "")
+        
         # Test for integer literal suffix
         int_type, maximum, new_end_pos = self._readIntSuffix()
         if new_end_pos: end_pos = new_end_pos
@@ -302,7 +375,8 @@ class Lexer:
             self._advance()
             if char == "": self._fatal(Lexer.L_EOF, f"{self._snapshot()}: expected character, got EOF.")
             char = self._peek()
-            large_peek = self._peek(10)
+            escpos = self.srcpos
+            source = self.source
             self._advance()
             if   char == "a": return ord('\a'), True
             elif char == "b": return ord('\b'), True
@@ -315,25 +389,27 @@ class Lexer:
             elif char == "'": return ord("'"), True
             elif char == '"': return ord('"'), True
             elif char == "0": return 0, True
-            elif (m := re.match(r"^([0-7]{1,3})", large_peek)):
-                self._advance(len(m.group())-1)
-                return int(m.group(1), base=8) % 0x100, True
-            elif (m := re.match(r"^x([0-9a-fA-F]{1,8})", large_peek)):
-                self._advance(len(m.group())-1)
-                if re.match(r"[0-9A-Za-f]", self._peek()):
+            elif (m := _OCT_ESC.match(source, escpos)):
+                self.srcpos = m.end()
+                return int(m.group(), base=8) % 0x100, True
+            elif (m := _HEX_ESC.match(source, escpos)):
+                self.srcpos = m.end()
+                if _HEX_WARN.match(source, self.srcpos):
                     self.logger.warn(f"{pos}: hexadecimal escape sequence '\\{m.group()}' read successfully, but is followed by more hexadecimal characters over the 8 character limit at {self._snapshot()}.")
                 return int(m.group(1), base=16), True
-            elif (m := re.match(r"^u([0-9a-fA-F]{4})", large_peek)):
-                self._advance(len(m.group())-1)
+            elif (m := _U4_ESC.match(source, escpos)):
+                self.srcpos = m.end()
                 val = int(m.group(1), base=16)
+                if val < 0x80: return val, False # ASCII needs no UTF-8 round-trip
                 try:
                     val = int.from_bytes(bytes(chr(val), encoding="utf8"), "big")
                 except ValueError:
                     self._fatal(Lexer.L_INVALIDUNICODECHAR, f"{pos}: invalid unicode literal '\\{m.group()}'")
                 return val, False
-            elif (m := re.match(r"^U([0-9a-fA-F]{8})", self._peek(9))):
-                self._advance(len(m.group())-1)
+            elif (m := _U8_ESC.match(source, escpos)):
+                self.srcpos = m.end()
                 val = int(m.group(1), base=16)
+                if val < 0x80: return val, False # ASCII needs no UTF-8 round-trip
                 try:
                     val = int.from_bytes(bytes(chr(val), encoding="utf8"), "big")
                 except ValueError:
@@ -343,7 +419,11 @@ class Lexer:
                 self.logger.warn(f"{pos}: escape character '\\' used in literal has no effect and only '{char}' will remain. did you mean to escape the backslash?")
         else:
             self._advance()
-        return int.from_bytes(bytes(char, encoding="utf8"), "big"), False
+        # ASCII characters are their own code point; only multi-byte UTF-8
+        # (or the empty EOF peek) needs the encode round-trip.
+        if char and (cp := ord(char)) < 128:
+            return cp, False
+        return int.from_bytes(char.encode("utf8"), "big"), False
     
     def _readIntSuffix(self) -> tuple[str, int, tuple[int, int] | None]:
         """
@@ -354,14 +434,13 @@ class Lexer:
         pos = None
         int_type = "int"
         if (peek := self._peek()) and peek.isalpha():
-            peek = peek.lower()
-            if   peek == "i": int_type = "int"
-            elif peek == "l": int_type = "long"
-            else: self._fatal(Lexer.L_INVALIDINTSUFFIX, f"{pos}: invalid numeric literal base suffix '{peek}'")
             pos = self._snapshot()
+            peek = peek.lower()
+            int_type = _SUFFIX_TYPES.get(peek)
+            if int_type is None:
+                self._fatal(Lexer.L_INVALIDINTSUFFIX, f"{pos}: invalid numeric literal base suffix '{peek}'")
             self._advance()
-        maximum = 1 << nstypes.CFG.INT_SIZES[int_type] * nstypes.CFG.BITS_PER_WORD
-        return int_type, maximum, pos
+        return int_type, _INT_TYPE_MAX[int_type], pos
     
     def _readString(self) -> Token:
         """
@@ -374,24 +453,34 @@ class Lexer:
         if self._peek() != '"':
             self._fatal(Lexer.L_UNKNOWN, f"{start_pos}: expected start of string, but did not get opening double quote.")
         
-        def int_to_smallest_bytes(val: int) -> bytes:
-            from math import ceil, log
-            if val == 0: return b"\0"
-            if val == 1: return b"\1"
-            length = ceil(log(val)/log(256))
-            return val.to_bytes(length, "big")
-        
         string = []
+        source = self.source
         while self._peek() == '"':
             # Discard opening double quote
             self._advance()
             
-            while self._peek() != '"':
+            while True:
+                # Bulk-copy the run up to the next quote or escape; encoding
+                # the slice as UTF-8 packs it exactly as the per-character
+                # path would.
+                m = _STR_PLAIN.match(source, self.srcpos)
+                if m:
+                    string.extend(m.group().encode("utf8"))
+                    self.srcpos = m.end()
+                char = self._peek()
+                if char == '"': break
+                if char == "":
+                    self._fatal(Lexer.L_EOF, f"{self._snapshot()}: unexpected EOF in string literal at {start_pos}")
+                
                 char_pos = self._snapshot()
                 char_int, not_unicode = self._readCharAsInt()
-                if not_unicode and char_int > 127:
-                    self._fatal(Lexer.L_INVALIDSTRINGCHAR, f"{char_pos}: non UTF-8 character in string has value '{char_int}' which is outside the allowed non-unicode range (0-127).")
-                string.extend(int_to_smallest_bytes(char_int))
+                if char_int > 127:
+                    if not_unicode:
+                        self._fatal(Lexer.L_INVALIDSTRINGCHAR, f"{char_pos}: non UTF-8 character in string has value '{char_int}' which is outside the allowed non-unicode range (0-127).")
+                    # Smallest big-endian byte run holding the value.
+                    string.extend(char_int.to_bytes((char_int.bit_length() + 7) // 8, "big"))
+                else:
+                    string.append(char_int)
             
             end_pos = self._snapshot()
             
@@ -407,20 +496,18 @@ class Lexer:
         return Token(TokenType.STRING, string, start_pos, end_pos)
     
     def _tryReadPunc(self) -> Token | None:
-        start_pos = self._snapshot()
-        
-        # Try matching any punctuator
-        punct_matches = []
-        for punct in Punctuators:
-            if punct == self._peek(len(punct)):
-                punct_matches.append(punct)
+        # Candidates are pre-sorted longest-first, so the first hit is the
+        # greedy match the old sort-by-length scan produced.
+        cands = _PUNC_BY_PREFIX.get(self.source[self.srcpos])
+        if cands is None: return None
         
-        # Return None if no punctuators matched
-        if len(punct_matches) == 0: return None
+        for punct in cands:
+            if self.source.startswith(punct, self.srcpos):
+                break
+        else:
+            return None
         
-        # Sort to get the biggest matching operator greedily
-        list.sort(punct_matches, key = lambda punct: len(punct), reverse=True)
-        punct = punct_matches[0]
+        start_pos = self._snapshot()
         
         # Read through punctuator
         self._advance(len(punct)-1)
@@ -432,16 +519,19 @@ class Lexer:
     def _tryReadKeywordOrName(self) -> Token | None:
         start_pos = self._snapshot()
         
-        # Return None if name does not start with an underscore or ASCII letter
-        if (peek := self._peek()) and not (peek == "_" or peek.isalpha() and peek.isascii()):
+        start = self.srcpos
+        
+        # No match means the name does not start with an underscore or ASCII letter
+        m = _NAME_RE.match(self.source, start)
+        if m is None:
             return None
         
-        # Read name
-        name = ""
-        while (peek := self._peek()) and (peek == "_" or peek.isalnum() and peek.isascii()):
-            name += peek
-            end_pos = self._snapshot()
-            self._advance()
+        i = m.end()
+        end_pos = self._pos_at(i - 1)
+        self._advance(i - start)
+        # Interning makes repeat occurrences share one str and lets later
+        # equality checks short-circuit on identity.
+        name = sys.intern(m.group())
         
         # Check for keyword
         if name in Keywords:
@@ -21,6 +21,10 @@ class LoggerFactory:
                 self.warn("tried changing logger level to invalid value.")
             self._level = loglevel
         
+        def isEnabledFor(self, loglevel: LogLevel) -> bool:
+            "Returns whether a message at the given level would be emitted."
+            return loglevel >= self._level
+        
         def log(self, message: str, loglevel: LogLevel=LogLevel.WARN):
             if loglevel.value < self._level.value: return
             pad = ""
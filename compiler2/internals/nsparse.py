@@ -92,6 +92,22 @@ a_expr_list := a_expr [',' a_expr] ;
 init_expr_list := init_expr [',' init_expr ] ;
 n_init_expr_list := NAME ':' init_expr [',' NAME ':' init_expr] ;
 """
+
+# Token-value sets used by the dispatch predicates; a frozenset gives the
+# istype membership test a hash probe instead of a tuple scan per call.
+_MODIFIER_KWS = frozenset(("static", "inline"))
+_TYPEDECL_KWS = frozenset(("using", "struct", "union"))
+_RECORD_KWS = frozenset(("struct", "union"))
+_INT_KWS = frozenset(("int", "long"))
+_TYPE_KWS = frozenset(("void", "int", "long", "func", "struct", "union"))
+_TYPE_PUNCS = frozenset(("*", "["))
+_STMT_KWS = frozenset(("continue", "break", "breakif", "return", "if", "while", "for"))
+_STMT_PUNCS = frozenset((";", "{"))
+_BREAK_KWS = frozenset(("break", "breakif"))
+_CTRL_KWS = frozenset(("if", "while", "for"))
+_SIZE_PUNCS = frozenset(("szexpr", "sztype"))
+_ADDR_PUNCS = frozenset(("*", "&"))
+
 class Parser:
     L_UNKNOWN = 1
     L_EATWRONGTYPE = 2
@@ -112,6 +128,26 @@ class Parser:
         self.logger = nslog.LoggerFactory.getLogger()
         self.success = True
         
+        # Comment-free view of the stream plus index maps, so peeking is a
+        # plain indexed lookup instead of slicing and filtering per call.
+        self.code_tokens: list[Token] = []
+        self._code_to_raw: list[int] = [] # code index -> raw index in tokens
+        self._code_before = code_before = [0] * (len(tokens) + 1) # raw index -> # code tokens before it
+        count = 0
+        for i, token in enumerate(tokens):
+            code_before[i] = count
+            if not token.iscomment():
+                self.code_tokens.append(token)
+                self._code_to_raw.append(i)
+                count += 1
+        code_before[len(tokens)] = count
+        
+        # Shared sentinels for peeking past either end of the stream.
+        bof_anchor = tokens[0].start_pos if tokens else (1, 0)
+        eof_anchor = tokens[-1].start_pos if tokens else (1, 0)
+        self._bof_token = Token(TokenType.EOF, None, bof_anchor, bof_anchor)
+        self._eof_token = Token(TokenType.EOF, None, eof_anchor, eof_anchor)
+        
     def _snapshot(self) -> tuple[int, int]:
         "Returns the starting position of the current token."
         return self._peek().start_pos
@@ -127,6 +163,10 @@ class Parser:
         self.success = False
         raise Exception("nsparse encountered a fatal error.")
     
+    def _off_end(self, ahead: int) -> Token:
+        "Returns the EOF stand-in for peeks outside the token stream."
+        return self._bof_token if self.pos + ahead < 0 else self._eof_token
+    
     def _peek(self, ahead=0, skip_comment = True) -> Token | None:
         """
         Peeks a token starting `ahead` tokens off from the current position. `ahead` can be negative to look behind.
@@ -135,21 +175,21 @@ class Parser:
         
         Will return EOF token if start of file or EOF is met.
         """
-        if ahead < 0:
-            tokens = self.tokens[:self.pos]
-        else:
-            tokens = self.tokens[self.pos:]
         if skip_comment:
-            tokens = list(filter(lambda token: not token.iscomment(), tokens))
-        token = tokens[ahead:]
-        if len(token) < 1:
-            return Token(
-                TokenType.EOF,
-                None,
-                self.tokens[0 if self.pos+ahead<0 else -1].start_pos,
-                self.tokens[0 if self.pos+ahead<0 else -1].start_pos
-            )
-        return token[0]
+            tokens = self.code_tokens
+            idx = self._code_before[self.pos] + ahead
+        else:
+            tokens = self.tokens
+            idx = self.pos + ahead
+        if ahead < 0:
+            if idx - ahead < 1: # Nothing at all behind the cursor
+                return self._off_end(ahead)
+            # Peeking further back than the stream goes clamps to its start,
+            # mirroring how a negative slice bound behaves.
+            return tokens[idx if idx >= 0 else 0]
+        if idx < len(tokens):
+            return tokens[idx]
+        return self._off_end(ahead)
     
     def _eat(self, token_type: TokenType | None = None, token_value: any = None, skip_comment = True) -> Token:
         """
@@ -165,9 +205,12 @@ class Parser:
             self._fatal(Parser.L_EATWRONGTYPE, f"{pos}: expected type '{token_type.name}', got '{cur.type.name}'")
         if token_value and cur.value != token_value:
             self._fatal(Parser.L_EATWRONGVALUE, f"{pos}: expected value '{token_value}', got '{cur.value}'")
-        while self._peek(skip_comment=False) != cur: # Skip over passed comments
-            self.pos += 1
-        self.pos += 1
+        if skip_comment:
+            # Jump straight past the eaten token (and any comments before it).
+            ci = self._code_before[self.pos]
+            self.pos = self._code_to_raw[ci] + 1 if ci < len(self.code_tokens) else len(self.tokens)
+        else:
+            self.pos = min(self.pos + 1, len(self.tokens))
         return cur
     
     def parse_module(self) -> ast.Module:
@@ -194,9 +237,18 @@ class Parser:
     
     def parse_global_decl(self) -> ast.Decl:
         "Parses a top-level declaration."
-        if self.can_parse_func_decl(): return self.parse_func_decl()
-        if self.can_parse_const_decl(): return self.parse_const_decl()
-        if self.can_parse_decl(): return self.parse_decl()
+        # One lookahead (two past a modifier) decides the production directly
+        # instead of re-peeking through every can_parse_* predicate.
+        token = self._peek()
+        modified = token.iskeyword(_MODIFIER_KWS)
+        after_mod = self._peek(1) if modified else token
+        if after_mod.iskeyword("func"): return self.parse_func_decl()
+        # Only the 'static' modifier may prefix const/var declarations, and
+        # type declarations take no modifier at all.
+        decl_kw = after_mod if token.iskeyword("static") else token
+        if decl_kw.iskeyword("set"): return self.parse_const_decl()
+        if decl_kw.iskeyword("let"): return self.parse_var_decl()
+        if token.iskeyword(_TYPEDECL_KWS): return self.parse_type_decl()
         self._fatal(Parser.L_FAILEDCHECK, f"{self._snapshot()}: expected global declaration but could not match pattern.")
             
     def can_parse_decl(self) -> bool:
@@ -206,14 +258,16 @@ class Parser:
     
     def parse_decl(self) -> ast.Decl:
         "Parses a normal declaration."
-        if self.can_parse_var_decl(): return self.parse_var_decl()
-        if self.can_parse_type_decl(): return self.parse_type_decl()
+        token = self._peek()
+        after_mod = self._peek(1) if token.iskeyword("static") else token
+        if after_mod.iskeyword("let"): return self.parse_var_decl()
+        if token.iskeyword(_TYPEDECL_KWS): return self.parse_type_decl()
         self._fatal(Parser.L_FAILEDCHECK, f"{self._snapshot()}: expected declaration but could not match pattern.")
     
     def can_parse_func_decl(self) -> bool:
         "Returns true if the next few tokens allow for parsing a function declaration"
         token = self._peek()
-        if token.iskeyword(("static", "inline")): token = self._peek(1)
+        if token.iskeyword(_MODIFIER_KWS): token = self._peek(1)
         return token.iskeyword("func")
     
     def parse_func_decl(self) -> ast.FuncDecl:
@@ -229,7 +283,7 @@ class Parser:
             comment = c.value
         
         # Get function modifiers
-        is_static = self._peek().iskeyword(("static", "inline"))
+        is_static = self._peek().iskeyword(_MODIFIER_KWS)
         is_inline = self._peek().iskeyword("inline")
         if is_static: self._eat()
         
@@ -374,7 +428,7 @@ class Parser:
         
     def can_parse_type_decl(self) -> bool:
         "Returns true if the next few tokens allow for parsing a type declaration"
-        return self._peek().iskeyword(("using", "struct", "union"))
+        return self._peek().iskeyword(_TYPEDECL_KWS)
     
     def parse_type_decl(self) -> ast.TypeDecl:
         "Parses a type reference declaration."
@@ -390,7 +444,7 @@ class Parser:
             name = self._eat(TokenType.NAME).value
             self._eat(TokenType.PUNC, ":=")
             type = self.parse_type()
-        elif keyword.iskeyword(("struct", "union")):
+        elif keyword.iskeyword(_RECORD_KWS):
             self.logger.debug(f"TypeDecl is with '{keyword.value}'.")
             name = self._eat(TokenType.NAME).value
             members = self._parse_record_def()
@@ -424,8 +478,8 @@ class Parser:
     def can_parse_type(self) -> bool:
         "Returns true if the next few tokens allow for parsing a type"
         token = self._peek()
-        if token.iskeyword(("void", "int", "long", "func", "struct", "union")): return True
-        if token.ispunc(('*', '[')): return True
+        if token.iskeyword(_TYPE_KWS): return True
+        if token.ispunc(_TYPE_PUNCS): return True
         if token.isname(): return True
         if token.iskeyword("volatile") and not self._peek().iskeyword("volatile"): return True
         return False
@@ -441,8 +495,11 @@ class Parser:
         is_volatile = self._peek().iskeyword("volatile")
         if is_volatile: self._eat()
         
-        # Figure out the type of Type
-        if not self.can_parse_type():
+        # Figure out the type of Type; one peek covers the can_parse_type checks
+        token = self._peek()
+        if not (token.isname()
+                or token.iskeyword(_TYPE_KWS)
+                or token.ispunc(_TYPE_PUNCS)):
             self._fatal(Parser.L_WRONGTOKEN, f"{start_pos} expected type literal but could not match pattern")
         token = self._eat()
         if   token.iskeyword("void"): # VoidType
@@ -450,7 +507,7 @@ class Parser:
             if is_volatile:
                 self._error(Parser.L_INVALID_MODIFIER, f"{start_pos}: type 'void' cannot take the 'volatile' modifier.")
             node = ast.VoidType(False)
-        elif token.iskeyword(("int", "long")): # IntType
+        elif token.iskeyword(_INT_KWS): # IntType
             self.logger.debug(f"found IntType of size '{token.value}'")
             node = ast.IntType(is_volatile=is_volatile, type=token.value)
         elif token.iskeyword("func"): # FuncType
@@ -471,7 +528,7 @@ class Parser:
             
             node = ast.FuncType(is_volatile=is_volatile, return_type=ret_type, param_types=param_types, is_variadic=is_variadic)
             del param_types, is_variadic, ret_type
-        elif token.iskeyword(("struct", "union")): # StructType, UnionType
+        elif token.iskeyword(_RECORD_KWS): # StructType, UnionType
             self.logger.debug(f"found record type of category '{token.value}'")
             members = self._parse_record_def()
             if token.iskeyword("struct"):
@@ -569,8 +626,8 @@ class Parser:
     def can_parse_stmt(self) -> bool:
         "Returns true if the next few tokens allow for parsing a statement"
         token = self._peek()
-        if token.iskeyword(("continue", "break", "breakif", "return", "if", "while", "for")): return True
-        if token.ispunc((";", "{")): return True
+        if token.iskeyword(_STMT_KWS): return True
+        if token.ispunc(_STMT_PUNCS): return True
         if token.isname() and self._peek(1).ispunc(":"): return True
         if self.can_parse_decl(): return True
         if self.can_parse_expr(): return True
@@ -590,9 +647,8 @@ class Parser:
             cstmt.end_lineno, cstmt.end_col_offset = stmt.end_lineno, stmt.end_col_offset
             return cstmt
         
-        # Figure out the type of Stmt
-        if not self.can_parse_stmt():
-            self._fatal(Parser.L_WRONGTOKEN, f"{start_pos} expected statement but could not match pattern")
+        # Figure out the type of Stmt; the branch chain covers every
+        # can_parse_stmt case, so no separate pre-check pass is needed.
         token = self._peek()
         if   token.ispunc(";"):
             self.logger.debug("found EmptyStmt")
@@ -620,7 +676,7 @@ class Parser:
             self._eat(TokenType.PUNC, ";")
             node = ast.ContinueStmt(label=label)
             del label
-        elif token.iskeyword(("break", "breakif")):
+        elif token.iskeyword(_BREAK_KWS):
             self.logger.debug("found BreakStmt")
             self._eat()
             breakif = token.iskeyword("breakif")
@@ -641,7 +697,7 @@ class Parser:
             self._eat(TokenType.PUNC, ";")
             node = ast.ReturnStmt(ret_expr=ret_expr)
             del ret_expr
-        elif token.iskeyword(("if", "while", "for")) or (token.isname() and self._peek(1).ispunc(":")):
+        elif token.iskeyword(_CTRL_KWS) or (token.isname() and self._peek(1).ispunc(":")):
             self._eat()
             # Try parsing label
             if token.iskeyword():
@@ -723,6 +779,8 @@ class Parser:
             node = ast.ExprStmt(expr=expr)
             self._eat(TokenType.PUNC, ";")
             del expr
+        else:
+            self._fatal(Parser.L_WRONGTOKEN, f"{start_pos} expected statement but could not match pattern")
             
         end_pos = self._peek(-1).end_pos
         
@@ -843,7 +901,7 @@ class Parser:
         if token.ispunc():
             if is_op_unary(token.value): return True
             if is_op_ucond(token.value): return True
-            if token.ispunc(("*", "&")): return True
+            if token.ispunc(_ADDR_PUNCS): return True
         return False
         
     def parse_s_expr(self) -> ast.Expr:
@@ -853,7 +911,7 @@ class Parser:
     def can_parse_atom(self) -> bool:
         "Returns true if the next few tokens allow for parsing an expression atom"
         token = self._peek()
-        if token.ispunc(("szexpr", "sztype")): return True
+        if token.ispunc(_SIZE_PUNCS): return True
         if token.ispunc("("): return True
         if token.isstring(): return True
         if token.isint(): return True
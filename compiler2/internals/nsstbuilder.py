@@ -68,21 +68,39 @@ def CompareTypesEq(type1: ast.Type, type2: ast.Type) -> bool:
         
     return False # Something went wrong
 
+# Fully resolved RefType expansions, keyed by the (scope, node) pair itself so
+# the entries also keep their keys alive.
+_expand_cache: dict[tuple[nsst.SymbolTable, ast.Type], ast.Type] = {}
+
 def ExpandType(scope: nsst.SymbolTable, type: ast.Type, recursive: bool=True) -> ast.Type | None:
     "Expand a RefType. Recursive by default. Returns None for undefined type references"
     if not isinstance(type, ast.Type): return None
+    if not isinstance(type, ast.RefType): return type
+    
+    if recursive:
+        expanded = _expand_cache.get((scope, type))
+        if expanded is not None: return expanded
+    
+    start_scope, start_type = scope, type
     while isinstance(type, ast.RefType):
         type = scope.get_typesym(type.ref_type_name)
         if type == None: break
         scope = type.get_table()
         type = type.get_type()
         if not recursive: break
+    
+    if recursive and type is not None:
+        _expand_cache[(start_scope, start_type)] = type
     return type
 
 def CompareTypesEquiv(scope: nsst.SymbolTable, type1: ast.Type, type2: ast.Type) -> bool | None:
     "Compares two types with type expansion if necessary. Returns None if a type could not be expanded"
     if not isinstance(type1, ast.Type) or not isinstance(type2, ast.Type): return False
     
+    # A type node is trivially equivalent to itself; this also short-circuits
+    # the recursive member-by-member walks below when subtrees are shared.
+    if type1 is type2: return True
+    
     # Reference types must be expanded
     type1 = ExpandType(scope, type1)
     type2 = ExpandType(scope, type2)
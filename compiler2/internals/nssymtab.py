@@ -24,6 +24,7 @@ class SymbolTable:
         self._names: OrderedDict[str, 'NameSymbol'] = OrderedDict()
         self._types: OrderedDict[str, 'TypeSymbol'] = OrderedDict()
         self._labels: OrderedDict[str, 'LabelSymbol'] = OrderedDict()
+        self._lookup_cache: dict[tuple[type, str], 'Symbol' | None] = {} # ancestry lookups resolved from this table
     
     def get_type(self) -> str:
         "Returns the type of SymbolTable."
@@ -97,8 +98,15 @@ class SymbolTable:
         
         symbol = symbols.get(name, None)
         if symbol != None or localonly: return symbol
-        if self._parent != None:
-            return self._parent._get_symbol(cls, name)
+        
+        key = (cls, name)
+        result = self._lookup_cache.get(key, False) # False marks a miss; None is a valid cached answer
+        if result is False:
+            result = None
+            if self._parent != None:
+                result = self._parent._get_symbol(cls, name)
+            self._lookup_cache[key] = result
+        return result
         
     def _bind_symbol(self, name: str, symbol: 'Symbol', overwrite = False) -> bool:
         "Private function that binds a symbol to the SymbolTable."
@@ -111,6 +119,14 @@ class SymbolTable:
         
         symbols[name] = symbol
         symbol._set_table(self)
+        
+        # A new binding can shadow names resolved through this table, so drop
+        # the memoized ancestry lookups here and below.
+        todo = [self]
+        while todo:
+            table = todo.pop()
+            table._lookup_cache.clear()
+            todo.extend(table._children)
         return True
         
 class ModuleTable(SymbolTable):
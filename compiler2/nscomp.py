@@ -124,8 +124,7 @@ def main(args):
         os.makedirs(args.dir, exist_ok=True)
         
         with open(outfile, "w") as f:
-            for line in assembly:
-                f.write(line)
+            f.writelines(assembly)
         
         complogger.info(f"successfully compiled \"{infile}\"")
     if success: